@@ -0,0 +1,274 @@
+"""Timing and memory benchmarks for the qbox pipeline stages.
+
+Each benchmark times one stage (mode tables, normalization, snapshot and
+density evaluation, animation frames, volume streaming, figure rendering)
+in 1D, 2D and 3D at several problem sizes, and reports the best wall time
+of a few repeats, the throughput and the peak traced memory. Results are written as
+JSON to ``benchmarks/results/<name>.json``, and ``--compare`` checks a run
+against a stored one, exiting non-zero when any case slows down by more than
+``--threshold``.
+
+    python benchmarks/bench.py --save baseline
+    python benchmarks/bench.py --compare baseline
+    python benchmarks/bench.py --quick -k snapshots
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS = Path(__file__).resolve().parent / "results"
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("QBOX_CACHE", "0")  # time the work, not cache hits
+
+from qbox.basis import FACTORS, SeparableBasis  # noqa: E402
+from qbox.core import energy, mass  # noqa: E402
+from qbox.frames import iter_frames  # noqa: E402
+from qbox.kernels import jit_available  # noqa: E402
+from qbox.norms import norm  # noqa: E402
+from qbox.spectrum import first_states  # noqa: E402
+from qbox.superposition import SuperpositionEvaluator  # noqa: E402
+from qbox.volume import write_volume  # noqa: E402
+
+L = 1e-9
+M = mass()
+
+# Points per sampled axis; the first two sizes form the --quick set.
+SIZES = {1: (10_000, 100_000, 1_000_000), 2: (100, 300, 1000), 3: (32, 64, 128)}
+MODES = (4, 16, 64)
+
+
+@dataclass
+class Case:
+    """One timed stage at one size.
+
+    ``setup`` builds the inputs (untimed) and returns the callable to time,
+    which does ``work`` units of ``unit`` per call.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    work: float
+    unit: str
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: float
+    rate: float
+    unit: str
+    peak_mib: float
+
+
+def _grid(dim: int, n: int) -> tuple[np.ndarray, ...]:
+    x = np.linspace(0, L, n)
+    return (x,) * dim
+
+
+def _modes(dim: int, k: int) -> np.ndarray:
+    return first_states(dim, k).states
+
+
+def _evaluator(dim: int, n: int, k: int) -> SuperpositionEvaluator:
+    modes = _modes(dim, k)
+    c = np.full(k, 1 / np.sqrt(k), dtype=np.complex128)
+    return SuperpositionEvaluator(
+        SeparableBasis(_grid(dim, n), L), modes, c, energy(modes, M, L)
+    )
+
+
+def cases(quick: bool) -> Iterator[Case]:
+    for dim, sizes in SIZES.items():
+        sizes = sizes[:2] if quick else sizes
+        for n in sizes:
+            points = n**dim
+            for k in MODES[:2] if quick else MODES:
+                if k * points * 8 > 2**28:
+                    continue
+                yield Case(
+                    f"modes/{dim}d/n={n}/k={k}",
+                    partial(_modes_case, dim, n, k),
+                    k * points,
+                    "points/s",
+                )
+                yield Case(
+                    f"snapshots/{dim}d/n={n}/k={k}",
+                    partial(_snapshots_case, dim, n, k, 16),
+                    16,
+                    "frames/s",
+                )
+                yield Case(
+                    f"density/{dim}d/n={n}/k={k}",
+                    partial(_density_case, dim, n, k, 16),
+                    16,
+                    "frames/s",
+                )
+            yield Case(
+                f"norm/{dim}d/n={n}", partial(_norm_case, dim, n), points, "points/s"
+            )
+            if dim < 3:
+                yield Case(
+                    f"frames/{dim}d/n={n}",
+                    partial(_frames_case, dim, n, 64),
+                    64,
+                    "frames/s",
+                )
+    for n in (32, 64) if quick else (32, 64, 128):
+        yield Case(f"volume/3d/n={n}", partial(_volume_case, n), n**3, "points/s")
+    yield from _render_cases(quick)
+
+
+def _modes_case(dim: int, n: int, k: int) -> Callable[[], object]:
+    grid, modes = _grid(dim, n), _modes(dim, k)
+
+    def run() -> np.ndarray:
+        FACTORS.clear()  # time building the sine tables, not cache hits
+        return SeparableBasis(grid, L).matrix(modes)
+
+    return run
+
+
+def _snapshots_case(dim: int, n: int, k: int, frames: int) -> Callable[[], object]:
+    evol, times = _evaluator(dim, n, k), np.linspace(0.0, 1e-14, frames)
+    return lambda: evol.psi(times)
+
+
+def _density_case(dim: int, n: int, k: int, frames: int) -> Callable[[], object]:
+    evol, times = _evaluator(dim, n, k), np.linspace(0.0, 1e-14, frames)
+    return lambda: evol.density(times)
+
+
+def _norm_case(dim: int, n: int) -> Callable[[], object]:
+    grid = _grid(dim, n)
+    psi = np.sin(np.linspace(0, 1, n**dim)).reshape((n,) * dim)
+    return lambda: norm(psi, *grid)
+
+
+def _frames_case(dim: int, n: int, frames: int) -> Callable[[], object]:
+    evol, times = _evaluator(dim, n, MODES[0]), np.linspace(0.0, 1e-14, frames)
+    return lambda: sum(1 for _ in iter_frames(evol, times))
+
+
+def _volume_case(n: int) -> Callable[[], object]:
+    modes = _modes(3, MODES[0])
+    c = np.full(len(modes), 0.5, dtype=np.complex128)
+    E = energy(modes, M, L)
+    g = np.linspace(0, L, n)
+    out = Path(tempfile.gettempdir()) / "qbox_bench_volume.npy"
+    return lambda: write_volume(out, (g, g, g), L, modes, c, E)
+
+
+def _render_cases(quick: bool) -> Iterator[Case]:
+    from qbox import figures
+
+    out = Path(tempfile.gettempdir()) / "qbox_bench_figure.png"
+
+    def save(build: Callable[[], object], dpi: int) -> None:
+        build().savefig(out, dpi=dpi)
+
+    for dim in (1, 2, 3):
+        sel = [tuple(ns) for ns in _modes(dim, 4).tolist()]
+        builders = {
+            "eigenfunctions": lambda s=sel: figures.plot_eigenfunctions(s, L),
+            "levels": lambda d=dim: figures.plot_energy_levels(d, M, L, 4),
+        }
+        for name, build in builders.items():
+            for dpi in (100,) if quick else (100, 200):
+                yield Case(
+                    f"render/{dim}d/{name}/dpi={dpi}",
+                    lambda b=build, d=dpi: lambda: save(b, d),
+                    1,
+                    "figures/s",
+                )
+
+
+def measure(case: Case, repeat: int) -> Result:
+    run = case.setup()
+    run()  # warm caches and imports
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return Result(case.name, best, case.work / best, case.unit, peak / 2**20)
+
+
+def compare(
+    results: list[Result], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Names of cases more than ``threshold`` times slower than ``baseline``."""
+    slow = []
+    for r in results:
+        ref = baseline.get(r.name)
+        if ref is not None and r.seconds > threshold * ref["seconds"]:
+            slow.append(f"{r.name}: {ref['seconds']:.4g}s -> {r.seconds:.4g}s")
+    return slow
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    p.add_argument("--quick", action="store_true", help="small sizes only")
+    p.add_argument("-k", dest="pattern", default="", help="substring filter")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--save", metavar="NAME", help="store results as NAME.json")
+    p.add_argument("--compare", metavar="NAME", help="check against NAME.json")
+    p.add_argument("--threshold", type=float, default=1.25)
+    args = p.parse_args(argv)
+
+    results = []
+    for case in cases(args.quick):
+        if args.pattern not in case.name:
+            continue
+        r = measure(case, args.repeat)
+        results.append(r)
+        print(
+            f"{r.name:<40} {r.seconds * 1e3:10.3f} ms {r.rate:12.4g} {r.unit:<10}"
+            f" {r.peak_mib:9.1f} MiB",
+            flush=True,
+        )
+
+    if args.save:
+        RESULTS.mkdir(exist_ok=True)
+        payload = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "numba": jit_available(),
+            "results": {r.name: asdict(r) for r in results},
+        }
+        path = RESULTS / f"{args.save}.json"
+        path.write_text(json.dumps(payload, indent=1))
+        print(f"Saved: {path.relative_to(ROOT)}")
+    if args.compare:
+        baseline = json.loads((RESULTS / f"{args.compare}.json").read_text())
+        slow = compare(results, baseline["results"], args.threshold)
+        for line in slow:
+            print(f"SLOWER {line}")
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
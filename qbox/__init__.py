@@ -0,0 +1,42 @@
+"""Shared numerics for the 1D/2D/3D particle-in-a-box scripts.
+
+The names below are loaded from their submodules on first access, so
+``import qbox`` is cheap and pulls in neither scipy nor matplotlib.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+_EXPORTS = {
+    "BoxConfig": "pipeline",
+    "Observables": "observables",
+    "SeparableBasis": "basis",
+    "Spectrum": "spectrum",
+    "SuperpositionEvaluator": "superposition",
+    "SuperpositionState": "superposition",
+    "box_energy": "core",
+    "cube_states": "spectrum",
+    "eigenfunction": "core",
+    "energy": "core",
+    "energy_unit": "spectrum",
+    "first_states": "spectrum",
+    "lowest_states": "spectrum",
+    "mass": "core",
+    "norm": "norms",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
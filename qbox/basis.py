@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import Callable, Hashable, Sequence
+
+import numpy as np
+
+FACTOR_CACHE_BYTES = 256 * 2**20
+
+
+def sine_factor(n: int, x: np.ndarray | float, L: float) -> np.ndarray:
+    """Normalized 1D box eigenfunction sqrt(2/L) sin(n pi x / L)."""
+    return np.sqrt(2.0 / L) * np.sin(n * math.pi * np.asarray(x, dtype=float) / L)
+
+
+def axis_lengths(L: float | Sequence[float], dim: int) -> tuple[float, ...]:
+    """Per-axis box lengths: ``L`` repeated for a cube, else checked per axis."""
+    if np.ndim(L) == 0:
+        return (float(L),) * dim
+    if len(L) != dim:
+        raise ValueError(f"expected {dim} box lengths, got {len(L)}")
+    return tuple(float(x) for x in L)
+
+
+class FactorCache:
+    """Least-recently-used store of sine factors, bounded in bytes.
+
+    Shared by every basis in the process and keyed on (grid, length, n,
+    dtype), so evaluators built on the same grid reuse each other's tables
+    and states with thousands of modes cannot grow memory without bound.
+    """
+
+    def __init__(self, max_bytes: int = FACTOR_CACHE_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        f = self._items.get(key)
+        if f is not None:
+            self._items.move_to_end(key)
+            return f
+        f = compute()
+        self._items[key] = f
+        self.nbytes += f.nbytes
+        while self.nbytes > self.max_bytes and len(self._items) > 1:
+            _, old = self._items.popitem(last=False)
+            self.nbytes -= old.nbytes
+        return f
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.nbytes = 0
+
+
+FACTORS = FactorCache()
+
+
+class SeparableBasis:
+    """Box eigenfunctions on a tensor grid, built from per-axis sine tables.
+
+    Every eigenfunction of the box separates into 1D factors, so a mode on a
+    tensor grid is the outer product of one factor per axis. Factors are
+    computed once per (grid, n) and shared, through ``FACTORS``, by every
+    mode and every basis that uses them.
+
+    ``axes`` lists the sample points of each axis in (x, y, z) order. An axis
+    given as a scalar is pinned to that coordinate, which turns the basis into
+    a slice (e.g. ``(x, y, L / 2)`` for the z=L/2 plane). Arrays are laid out
+    with x on the last axis, matching ``np.meshgrid`` and ``imshow``. ``L``
+    is the side of a cube or one length per axis for a rectangular box.
+
+    Factors are evaluated in float64 and stored as ``dtype``; pass float32
+    to halve the size of the tables and of ``matrix``.
+    """
+
+    def __init__(
+        self,
+        axes: Sequence[np.ndarray | float],
+        L: float | Sequence[float],
+        dtype: np.dtype | type = np.float64,
+    ) -> None:
+        self.axes = tuple(np.asarray(a, dtype=float) for a in axes)
+        self.lengths = axis_lengths(L, len(self.axes))
+        self.dtype = np.dtype(dtype)
+        self._keys = [
+            (a.shape, hash(a.tobytes()), Li, self.dtype.str)
+            for a, Li in zip(self.axes, self.lengths)
+        ]
+
+    @property
+    def ndim(self) -> int:
+        return len(self.axes)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(a.size for a in reversed(self.axes) if a.ndim)
+
+    def factor(self, axis: int, n: int) -> np.ndarray:
+        def compute() -> np.ndarray:
+            f = sine_factor(n, self.axes[axis], self.lengths[axis])
+            f = np.asarray(f, dtype=self.dtype)
+            f.flags.writeable = False  # shared through FACTORS
+            return f
+
+        return FACTORS.get((*self._keys[axis], n), compute)
+
+    def table(self, axis: int, ns: Sequence[int]) -> np.ndarray:
+        """Factors of ``ns`` on one axis stacked as rows, shape (len(ns), size)."""
+        return np.stack([self.factor(axis, int(n)) for n in ns])
+
+    def factors(self, ns: Sequence[int]) -> list[np.ndarray]:
+        """Per-axis factors of mode ``ns``; their outer product is the mode."""
+        if len(ns) != self.ndim:
+            raise ValueError(f"expected {self.ndim} quantum numbers, got {len(ns)}")
+        return [self.factor(i, int(n)) for i, n in enumerate(ns)]
+
+    def mode(self, ns: Sequence[int]) -> np.ndarray:
+        """Mode ``ns`` on the grid, as a new array (the factors are shared)."""
+        fs = self.factors(ns)
+        if len(fs) == 1:
+            return fs[0].copy()
+        out = fs[-1]
+        for f in fs[-2::-1]:
+            out = np.multiply.outer(out, f)
+        return out
+
+    def matrix(self, modes: Sequence[Sequence[int]]) -> np.ndarray:
+        """Stack of flattened modes, shape (len(modes), prod(shape))."""
+        out = np.empty((len(modes), math.prod(self.shape)), dtype=self.dtype)
+        for row, ns in zip(out, modes):
+            row[:] = self.mode(ns).ravel()
+        return out
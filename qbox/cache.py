@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import ast
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_DIR = ROOT / ".qbox_cache"
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+
+def _encode(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return {
+            "dtype": str(obj.dtype),
+            "shape": obj.shape,
+            "data": _encode(obj.tolist()),
+        }
+    if isinstance(obj, (complex, np.complexfloating)):
+        return [float(obj.real), float(obj.imag)]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, (list, tuple)):
+        return [_encode(v) for v in obj]
+    raise TypeError(f"cannot hash {type(obj).__name__}")
+
+
+def digest(*parts: Any) -> str:
+    """Stable SHA-256 of JSON-like parts (numbers, strings, lists, dicts, arrays)."""
+    text = json.dumps(parts, sort_keys=True, default=_encode)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def source_digest(*paths: str) -> str:
+    """Hash of source files, so cached artifacts expire when the code changes."""
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(Path(p).read_bytes())
+    return h.hexdigest()
+
+
+def package_digest() -> str:
+    return source_digest(*sorted(str(p) for p in Path(__file__).parent.glob("*.py")))
+
+
+@functools.lru_cache(maxsize=None)
+def module_closure(path: str) -> tuple[str, ...]:
+    """``path`` and every qbox module it imports, directly or transitively.
+
+    Found by parsing the imports (including those inside functions), so a
+    figure or cached array depends only on the code it can actually run:
+    editing ``thermo.py`` does not invalidate the energy-level figures.
+    """
+    package = Path(__file__).parent
+    seen: set[Path] = set()
+    todo = [Path(path).resolve()]
+    while todo:
+        file = todo.pop()
+        if file in seen or not file.is_file():
+            continue
+        seen.add(file)
+        for node in ast.walk(ast.parse(file.read_text(), str(file))):
+            if isinstance(node, ast.Import):
+                mods = [a.name for a in node.names]
+            elif not isinstance(node, ast.ImportFrom):
+                continue
+            elif node.level == 1 and file.parent == package:
+                base = [f"qbox.{node.module}"] if node.module else []
+                mods = base or [f"qbox.{a.name}" for a in node.names]
+            elif node.level == 0 and node.module:
+                mods = [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+            else:
+                continue
+            for mod in mods:
+                head, _, name = mod.partition(".")
+                if head == "qbox" and name:
+                    todo.append(package / f"{name.split('.')[0]}.py")
+    return tuple(sorted(str(f) for f in seen))
+
+
+def code_digest(path: str) -> str:
+    """``source_digest`` of ``module_closure(path)``."""
+    return source_digest(*module_closure(str(path)))
+
+
+class ArtifactCache:
+    """Content-addressed store for arrays and rendered files.
+
+    Entries live at ``root/<key[:2]>/<key><suffix>`` and are written
+    atomically, so concurrent workers can share one cache. A hit refreshes
+    the entry's mtime; ``evict`` drops least recently used entries until the
+    cache fits in ``max_bytes``.
+    """
+
+    def __init__(self, root: Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+
+    def path(self, key: str, suffix: str) -> Path:
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def _hit(self, key: str, suffix: str) -> Path | None:
+        p = self.path(key, suffix)
+        try:
+            os.utime(p)
+        except FileNotFoundError:
+            return None
+        return p
+
+    def _store(self, key: str, suffix: str, write: Callable[[Path], None]) -> Path:
+        dest = self.path(key, suffix)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(suffix=suffix, dir=dest.parent)
+        os.close(fd)
+        try:
+            write(Path(tmp))
+            os.replace(tmp, dest)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return dest
+
+    def get_file(self, key: str, suffix: str, dest: Path) -> bool:
+        """Copy a cached file to ``dest``; False on a miss."""
+        src = self._hit(key, suffix)
+        if src is None:
+            return False
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(src, dest)
+        return True
+
+    def put_file(self, key: str, suffix: str, src: Path) -> None:
+        self._store(key, suffix, lambda tmp: shutil.copyfile(src, tmp))
+
+    def arrays(
+        self, key: str, compute: Callable[[], dict[str, np.ndarray]]
+    ) -> dict[str, np.ndarray]:
+        """Return the arrays stored under ``key``, computing and storing on a miss."""
+        src = self._hit(key, ".npz")
+        if src is not None:
+            with np.load(src) as data:
+                return {k: data[k] for k in data.files}
+        out = compute()
+        self._store(key, ".npz", lambda tmp: np.savez(tmp, **out))
+        return out
+
+    def evict(self) -> None:
+        entries = []
+        for p in self.root.glob("*/*"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+
+@functools.lru_cache(maxsize=None)
+def default_cache() -> ArtifactCache | None:
+    """Cache configured by QBOX_CACHE_DIR / QBOX_CACHE_MAX_MB; None if QBOX_CACHE=0."""
+    if os.environ.get("QBOX_CACHE", "1") == "0":
+        return None
+    root = Path(os.environ.get("QBOX_CACHE_DIR", DEFAULT_DIR))
+    max_mb = float(os.environ.get("QBOX_CACHE_MAX_MB", DEFAULT_MAX_BYTES / 2**20))
+    return ArtifactCache(root, int(max_mb * 2**20))
+
+
+def cached_arrays(
+    name: str, params: Any, compute: Callable[[], dict[str, np.ndarray]]
+) -> dict[str, np.ndarray]:
+    """``compute()`` memoized in the default cache under ``(name, params)``.
+
+    The key also covers the source of the module defining ``compute`` and of
+    every qbox module it imports (``module_closure``).
+    """
+    cache = default_cache()
+    if cache is None:
+        return compute()
+    code = getattr(compute, "__code__", None)
+    origin = code_digest(code.co_filename) if code else package_digest()
+    return cache.arrays(digest(name, params, origin), compute)
@@ -0,0 +1,166 @@
+"""Command-line front end for the 1D/2D/3D runs: ``python -m qbox``.
+
+Defaults come from the parameters at the top of ``<dim>D/main.py``; flags
+override them for one run without editing the script.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import dataclasses
+from pathlib import Path
+from typing import Sequence
+
+from . import profiling
+from .cache import ROOT
+from .core import mass
+from .pipeline import BoxConfig, figure_jobs, run
+from .render import load_script
+
+
+def _ints(text: str) -> tuple[int, ...]:
+    return tuple(int(n) for n in text.split(","))
+
+
+def _lengths(text: str) -> float | tuple[float, ...]:
+    lengths = tuple(float(x) for x in text.split(","))
+    return lengths[0] if len(lengths) == 1 else lengths
+
+
+def _complexes(text: str) -> list[complex]:
+    return [complex(c.replace(" ", "")) for c in text.split(",")]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="python -m qbox",
+        description="Particle-in-a-box figures and energies.",
+    )
+    p.add_argument("--dim", type=int, choices=(1, 2, 3), default=1)
+    p.add_argument(
+        "--L",
+        type=_lengths,
+        metavar="L[,LY[,LZ]]",
+        help="box width in m, or one width per axis for a rectangular box",
+    )
+    p.add_argument(
+        "--mass", help="particle mass in kg, or 'electron' (default: the script's)"
+    )
+    p.add_argument("--nmax", type=int, help="largest n per axis in level plots")
+    p.add_argument(
+        "--coeffs", type=_complexes, help="superposition coefficients, e.g. 1,1j"
+    )
+    p.add_argument(
+        "--state",
+        type=_ints,
+        action="append",
+        dest="n_vals",
+        metavar="N[,N...]",
+        help="quantum numbers of one superposed state (repeat per state)",
+    )
+    p.add_argument("--anim-frames", type=int, help="animation frames (0 disables)")
+    p.add_argument("--anim-file", help="animation file or frame directory name")
+    p.add_argument("--volume-ngrid", type=int, help="3D volume points per axis")
+    p.add_argument("--workers", type=int, help="render processes (1 = in-process)")
+    p.add_argument(
+        "--precision",
+        choices=("double", "single"),
+        help="float64 or float32 grids for snapshots, animation and volume",
+    )
+    p.add_argument(
+        "--validate-precision",
+        action="store_true",
+        help="compare the chosen precision against float64 before the run",
+    )
+    p.add_argument(
+        "--only",
+        type=lambda s: s.split(","),
+        metavar="NAME[,NAME...]",
+        help="render only these figures, e.g. energy_levels,eigenfunction_n1",
+    )
+    p.add_argument("--dpi", type=int, default=200)
+    p.add_argument("--format", default="png", dest="fmt", help="png, svg, pdf, ...")
+    p.add_argument(
+        "--no-plots",
+        action="store_false",
+        dest="plots",
+        help="print the energies only; matplotlib is not imported",
+    )
+    p.add_argument(
+        "--force",
+        action="store_true",
+        help="re-render every figure, ignoring the manifest and the figure cache",
+    )
+    p.add_argument(
+        "--out", type=Path, help="output directory (default: the <dim>D folder)"
+    )
+    p.add_argument(
+        "--profile",
+        type=Path,
+        metavar="REPORT.json",
+        help="write per-stage timings of the run to this JSON file",
+    )
+    p.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="also record per-stage peak memory (tracemalloc; slower)",
+    )
+    p.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="also run cProfile; saved next to the report as .prof",
+    )
+    return p
+
+
+def config(args: argparse.Namespace) -> BoxConfig:
+    """The script's config for ``args.dim`` with the given flags applied."""
+    cfg = load_script(ROOT / f"{args.dim}D" / "main.py").config()
+    overrides = {
+        field: getattr(args, field)
+        for field in (
+            "L",
+            "nmax",
+            "coeffs",
+            "n_vals",
+            "anim_frames",
+            "anim_file",
+            "volume_ngrid",
+            "workers",
+            "precision",
+        )
+        if getattr(args, field) is not None
+    }
+    if args.validate_precision:
+        overrides["validate_precision"] = True
+    if args.mass is not None:
+        overrides["m"] = mass(args.mass, None if args.mass == "electron" else args.mass)
+    return dataclasses.replace(cfg, **overrides)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        cfg = config(args)
+        figure_jobs(cfg, Path(), only=args.only)
+    except ValueError as exc:
+        parser.error(str(exc))
+    out = args.out or ROOT / f"{args.dim}D"
+    if args.profile is None:
+        profiled = contextlib.nullcontext()
+    else:
+        profiled = profiling.session(
+            args.profile, memory=args.profile_memory, cprofile=args.cprofile
+        )
+    with profiled:
+        run(
+            cfg,
+            out,
+            dpi=args.dpi,
+            fmt=args.fmt,
+            only=args.only,
+            plots=args.plots,
+            force=args.force,
+        )
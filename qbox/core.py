@@ -0,0 +1,75 @@
+"""Energies and eigenfunctions of the infinite box in any dimension.
+
+A state is a vector of quantum numbers ``(n_x, n_y, ...)``; arrays of states
+put the quantum numbers on the last axis, so ``(K, dim)`` holds K states.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from . import units
+from .basis import SeparableBasis, axis_lengths
+from .spectrum import box_weights, energy_unit
+
+
+def mass(mode: str = "electron", value: float | None = None) -> float:
+    """Particle mass in kg: the electron mass, or ``value`` for any other mode."""
+    return units.m_e if mode == "electron" else float(value)
+
+
+def energy(
+    ns: np.ndarray | Sequence | int,
+    m: float | np.ndarray,
+    L: float | np.ndarray,
+) -> np.ndarray:
+    """E = pi^2 hbar^2 sum(n_i^2) / (2 m L^2) in joules for every state in ``ns``.
+
+    ``ns`` has shape (..., dim); a bare integer is a single 1D state. ``m``
+    and ``L`` may be arrays and broadcast against the state shape (...), so
+    a sweep is one expression, e.g. ``energy(states[:, None], m, Ls)`` for
+    every (state, length) pair with shape (K, len(Ls)).
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    if ns.ndim == 0:
+        ns = ns[None]
+    s = np.einsum("...i,...i->...", ns, ns)
+    return s * energy_unit(m, L)
+
+
+def box_energy(
+    ns: np.ndarray | Sequence | int, m: float, lengths: float | Sequence[float]
+) -> np.ndarray:
+    """E = pi^2 hbar^2 sum((n_i / L_i)^2) / (2 m) in joules for a rectangular box.
+
+    ``lengths`` is one length per axis in (x, y, z) order, or a single
+    length for a cube, where this equals ``energy``.
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    if ns.ndim == 0:
+        ns = ns[None]
+    L = axis_lengths(lengths, ns.shape[-1])
+    return (ns * ns) @ box_weights(L) * energy_unit(m, L[0])
+
+
+def eigenfunction(
+    ns: np.ndarray | Sequence,
+    grids: Sequence[np.ndarray | float],
+    L: float | Sequence[float],
+) -> np.ndarray:
+    """Normalized eigenfunctions sampled on the tensor grid ``grids``.
+
+    ``grids`` lists the sample points in (x, y, z) order; a scalar pins that
+    axis, giving a slice (see ``SeparableBasis``); ``L`` may give one length
+    per axis. ``ns`` of shape (dim,) returns one array of the grid's shape
+    (x last); ``ns`` of shape (..., dim) returns a stack of shape
+    (..., *grid shape).
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    basis = SeparableBasis(grids, L)
+    if ns.ndim <= 1:
+        return basis.mode(np.atleast_1d(ns))
+    flat = ns.reshape(-1, ns.shape[-1])
+    return basis.matrix(flat).reshape(*ns.shape[:-1], *basis.shape)
@@ -0,0 +1,347 @@
+"""Figure builders shared by the 1D, 2D and 3D scripts.
+
+Every builder takes plain, picklable arguments and returns a
+``matplotlib.figure.Figure`` so it can be named as a ``FigureJob`` target
+(``"qbox.figures:plot_energy_levels"``). The dimension is read from the
+quantum numbers, or passed as ``dim`` where there are none. ``L`` is the
+side of a cube or one length per axis for a rectangular box. Line plots run
+along x with the other axes pinned at L/2; image plots show the x-y plane
+with z pinned at L/2. matplotlib is imported only when a figure is built.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+
+from . import units
+from .basis import SeparableBasis, axis_lengths
+from .cache import cached_arrays
+from .core import box_energy
+from .norms import slice_norm
+from .precision import dtypes
+from .profiling import stage
+from .render import add_dim_label
+from .spectrum import LEVEL_RTOL, box_weights, cube_states, energy_unit
+from .superposition import SuperpositionEvaluator, superposition
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+CURVE_POINTS = 1000
+NGRID = {1: 2000, 2: 300, 3: 250}
+
+
+def _figure(**kwargs) -> Figure:
+    from matplotlib.figure import Figure
+
+    return Figure(**kwargs)
+
+
+def state_label(ns: Sequence[int]) -> str:
+    """``n=3`` for a 1D state, ``(1,2,1)`` otherwise."""
+    if len(ns) == 1:
+        return f"n={ns[0]}"
+    return "(" + ",".join(str(n) for n in ns) + ")"
+
+
+def _pinned(dim: int) -> str:
+    return "" if dim == 1 else f" ({'='.join('yz'[: dim - 1])}=L/2)"
+
+
+def _weights(L: float | Sequence[float], dim: int) -> np.ndarray | None:
+    """``box_weights`` of a rectangular box, None for a cube (exact integer s)."""
+    return None if np.ndim(L) == 0 else box_weights(axis_lengths(L, dim))
+
+
+def _extent(L: float | Sequence[float], dim: int) -> list[float]:
+    Lx, Ly = axis_lengths(L, dim)[:2]
+    return [0, Lx, 0, Ly]
+
+
+def snapshot_grids(
+    dim: int, L: float | Sequence[float], n: int | None = None
+) -> tuple[np.ndarray | float, ...]:
+    """Sample axes of the snapshot and animation figures in (x, y, z) order.
+
+    ``n`` overrides the default ``NGRID[dim]`` points per sampled axis.
+    """
+    lengths = axis_lengths(L, dim)
+    n = n or NGRID[dim]
+    sampled = tuple(np.linspace(0, Li, n) for Li in lengths[:2])
+    return sampled + tuple(Li * 0.5 for Li in lengths[2:])
+
+
+def snapshot_superposition(
+    m: float,
+    L: float | Sequence[float],
+    coeffs: Sequence[complex],
+    n_vals: Sequence[Sequence[int]],
+    precision: str = "double",
+) -> tuple[SuperpositionEvaluator, float]:
+    """Evaluator on ``snapshot_grids`` and the beat period of the superposition."""
+    real, _ = dtypes(precision)
+    basis = SeparableBasis(snapshot_grids(len(n_vals[0]), L), L, dtype=real)
+    return superposition(basis, n_vals, coeffs, m, L)
+
+
+def spectrum(
+    dim: int, m: float, L: float | Sequence[float], nmax: int
+) -> tuple[list[tuple[int, ...]], np.ndarray]:
+    """States with every n_i <= nmax sorted by energy, and their energies in eV."""
+
+    def compute() -> dict[str, np.ndarray]:
+        with stage("enumerate"):
+            spec = cube_states(dim, nmax, _weights(L, dim))
+        Lx = axis_lengths(L, dim)[0]
+        return {"modes": spec.states, "E": spec.energies(m, Lx) / units.e}
+
+    data = cached_arrays(f"spectrum{dim}d", (m, L, nmax), compute)
+    return [tuple(int(n) for n in ns) for ns in data["modes"]], data["E"]
+
+
+def _level_axes(
+    states: Sequence[Sequence[int]], m: float, L: float | Sequence[float]
+) -> tuple[np.ndarray, SeparableBasis, np.ndarray, float]:
+    dim = len(states[0])
+    lengths = axis_lengths(L, dim)
+    x = np.linspace(0, lengths[0], CURVE_POINTS)
+    basis = SeparableBasis((x,) + tuple(Li * 0.5 for Li in lengths[1:]), lengths)
+    E = box_energy(states, m, lengths) / units.e
+    uniq = np.unique(E)
+    spc = float(np.min(np.diff(uniq))) if len(uniq) > 1 else 1.0
+    return x, basis, E, spc
+
+
+def _finish_levels(ax, fig, E: np.ndarray, spc: float, Lx: float, title: str) -> None:
+    ax.set_xlim(0, Lx)
+    ax.set_ylim(E.min() - spc * 0.6, E.max() + spc * 0.6)
+    ax.set_xlabel("x (m)")
+    ax.set_ylabel("Energy (eV)")
+    ax.set_title(title)
+    fig.tight_layout()
+
+
+def plot_psi_levels(
+    states: Sequence[Sequence[int]], m: float, L: float | Sequence[float]
+) -> Figure:
+    x, basis, E, spc = _level_axes(states, m, L)
+    s = 0.35 * spc
+    fig = _figure(figsize=(6, 8))
+    ax = fig.add_subplot()
+    for ns, En in zip(states, E):
+        ax.plot(x, En + s * basis.mode(ns), color="tab:blue")
+        ax.hlines(En, x[0], x[-1], colors="tab:blue", linestyles="dashed", alpha=0.6)
+        ax.text(x[-1] * 1.02, En, state_label(ns), va="center")
+    dim = len(states[0])
+    _finish_levels(
+        ax, fig, E, spc, x[-1], f"Eigenfunctions{_pinned(dim)} at energy levels"
+    )
+    add_dim_label(fig, f"{dim}D")
+    return fig
+
+
+def plot_density_levels(
+    states: Sequence[Sequence[int]], m: float, L: float | Sequence[float]
+) -> Figure:
+    x, basis, E, spc = _level_axes(states, m, L)
+    fig = _figure(figsize=(6, 8))
+    ax = fig.add_subplot()
+    for ns, En in zip(states, E):
+        r = basis.mode(ns) ** 2
+        a = (0.6 * spc) / float(np.max(r))
+        ax.plot(x, En + a * r, color="tab:blue")
+        ax.hlines(En, x[0], x[-1], colors="tab:blue", linestyles="dashed", alpha=0.6)
+        ax.text(x[-1] * 1.02, En, state_label(ns), va="center")
+    dim = len(states[0])
+    _finish_levels(ax, fig, E, spc, x[-1], f"Densities{_pinned(dim)} at energy levels")
+    add_dim_label(fig, f"{dim}D")
+    return fig
+
+
+def plot_energy_levels(
+    dim: int, m: float, L: float | Sequence[float], nmax: int
+) -> Figure:
+    """Level diagram: one line per state in 1D/2D, per degenerate level above.
+
+    In a rectangular box levels within ``LEVEL_RTOL`` count as degenerate.
+    """
+    if dim >= 3:
+        return _plot_degenerate_levels(dim, m, L, nmax)
+    states, E = spectrum(dim, m, L, nmax)
+    fig = _figure(figsize=(6, 4))
+    ax = fig.add_subplot()
+    for ns, Ek in zip(states, E):
+        ax.hlines(Ek, 0.8, 1.2, colors="tab:blue")
+        ax.text(1.22, Ek, state_label(ns), va="center")
+    ax.set_xlim(0.7, 1.45 if dim == 1 else 1.55)
+    ax.set_ylim(0, E[-1] * 1.1)
+    ax.set_ylabel("Energy (eV)")
+    ax.set_title(f"Energy levels ({dim}D infinite well)")
+    ax.set_xticks([])
+    fig.tight_layout()
+    add_dim_label(fig, f"{dim}D")
+    return fig
+
+
+def _plot_degenerate_levels(
+    dim: int, m: float, L: float | Sequence[float], nmax: int
+) -> Figure:
+    weights = _weights(L, dim)
+    spec = cube_states(dim, nmax, weights, 0.0 if weights is None else LEVEL_RTOL)
+    uniq_E = spec.levels * (energy_unit(m, axis_lengths(L, dim)[0]) / units.e)
+    fig = _figure(figsize=(7.5, 4.2))
+    ax = fig.add_subplot()
+    for i, En in enumerate(uniq_E):
+        states = spec.level_states(i).tolist()
+        ax.hlines(En, 0.8, 1.2, colors="tab:blue")
+        sample = ", ".join(state_label(ns) for ns in states[:3])
+        more = f", … (g={len(states)})" if len(states) > 3 else f"  (g={len(states)})"
+        ax.text(1.24, En, sample + more, va="center")
+    ax.set_xlim(0.7, 1.8)
+    ax.set_ylim(0, float(uniq_E[-1]) * 1.1)
+    ax.set_ylabel("Energy (eV)")
+    ax.set_title(f"Energy levels ({dim}D) — unique energies with degeneracy g")
+    ax.set_xticks([])
+    fig.tight_layout()
+    add_dim_label(fig, f"{dim}D")
+    return fig
+
+
+def plot_energy_vs_n(
+    dim: int, m: float, L: float | Sequence[float], nmax: int
+) -> Figure:
+    states, E = spectrum(dim, m, L, nmax)
+    fig = _figure(figsize=(6, 4))
+    ax = fig.add_subplot()
+    ax.plot(np.arange(1, len(states) + 1), E, marker="o")
+    if dim == 1:
+        ax.set_xlabel("n")
+        ax.set_title("Energy vs n (1D infinite well)")
+    else:
+        ax.set_xlabel("mode index k")
+        ax.set_title(f"Energy vs mode index ({dim}D)")
+    ax.set_ylabel("Energy (eV)")
+    fig.tight_layout()
+    add_dim_label(fig, f"{dim}D")
+    return fig
+
+
+def _plane(dim: int, L: float | Sequence[float]) -> SeparableBasis:
+    return SeparableBasis(snapshot_grids(dim, L), L)
+
+
+def plot_eigenfunctions(
+    states: Sequence[Sequence[int]], L: float | Sequence[float]
+) -> Figure:
+    dim = len(states[0])
+    if dim == 1:
+        x = np.linspace(0, axis_lengths(L, 1)[0], CURVE_POINTS)
+        basis = SeparableBasis((x,), L)
+        fig = _figure(figsize=(7, 4))
+        ax = fig.add_subplot()
+        for ns in states:
+            ax.plot(x, basis.mode(ns), label=state_label(ns))
+        ax.set_xlabel("x (m)")
+        ax.set_ylabel("psi_n(x)")
+        ax.set_title("Eigenfunctions ψn(x)")
+        ax.legend()
+    else:
+        basis = _plane(dim, L)
+        fig = _figure(figsize=(8, 7))
+        axs = fig.subplots(2, 2)
+        for ax, ns in zip(axs.ravel(), states):
+            ax.imshow(
+                basis.mode(ns), extent=_extent(L, dim), origin="lower", cmap="RdBu"
+            )
+            if dim == 2:
+                ax.set_title(f"ψ (nx,ny)={state_label(ns)}")
+            else:
+                ax.set_title(f"ψ z=L/2  {state_label(ns)}")
+            ax.set_xlabel("x (m)")
+            ax.set_ylabel("y (m)")
+    fig.tight_layout()
+    add_dim_label(fig, f"{dim}D")
+    return fig
+
+
+def plot_eigenfunction(ns: Sequence[int], L: float | Sequence[float]) -> Figure:
+    dim = len(ns)
+    if dim == 1:
+        x = np.linspace(0, axis_lengths(L, 1)[0], CURVE_POINTS)
+        fig = _figure(figsize=(6, 3.5))
+        ax = fig.add_subplot()
+        ax.plot(x, SeparableBasis((x,), L).mode(ns), color="tab:blue")
+        ax.set_xlabel("x (m)")
+        ax.set_ylabel("ψ(x)")
+        ax.set_title(f"Eigenfunction ψ for {state_label(ns)}")
+    else:
+        fig = _figure(figsize=(5.5, 4.5))
+        ax = fig.add_subplot()
+        P = _plane(dim, L).mode(ns)
+        ax.imshow(P, extent=_extent(L, dim), origin="lower", cmap="RdBu")
+        ax.set_xlabel("x (m)")
+        ax.set_ylabel("y (m)")
+        if dim == 2:
+            ax.set_title(f"Eigenfunction ψ for (nx,ny)={state_label(ns)}")
+        else:
+            ax.set_title(f"Eigenfunction ψ z=L/2 {state_label(ns)}")
+    fig.tight_layout()
+    add_dim_label(fig, f"{dim}D")
+    return fig
+
+
+def plot_density_snapshots(
+    m: float,
+    L: float | Sequence[float],
+    coeffs: Sequence[complex],
+    n_vals: Sequence[Sequence[int]],
+    precision: str = "double",
+) -> Figure:
+    dim = len(n_vals[0])
+    grids = snapshot_grids(dim, L)
+    x = grids[0]
+
+    def compute() -> dict[str, np.ndarray]:
+        with stage("modes"):
+            evol, T = snapshot_superposition(m, L, coeffs, n_vals, precision)
+        times = np.array([0.0, 0.25 * T, 0.5 * T])
+        with stage("evaluate"):
+            return {
+                "times": times,
+                "psi": evol.psi(times),
+                "amps": evol.amplitudes(times),
+            }
+
+    params = (m, L, coeffs, n_vals, NGRID[dim], precision)
+    data = cached_arrays(f"snapshots{dim}d", params, compute)
+    with stage("norm"):
+        pinned = [None if np.ndim(g) else g for g in grids]
+        norms = slice_norm(n_vals, data["amps"], pinned, L)
+    snaps = list(zip(data["times"], data["psi"], norms))
+    if dim == 1:
+        fig = _figure(figsize=(7, 4.5))
+        ax = fig.add_subplot()
+        for t, p, N in snaps:
+            ax.plot(x, np.abs(p) ** 2, label=f"t={t:.2e}s  N={N:.3f}")
+        ax.set_xlabel("x (m)")
+        ax.set_ylabel("|psi|^2")
+        ax.set_title("Probability density snapshots")
+        ax.legend()
+    else:
+        fig = _figure(figsize=(9, 3.6))
+        for idx, (t, p, N) in enumerate(snaps, start=1):
+            ax = fig.add_subplot(1, 3, idx)
+            ax.imshow(
+                np.abs(p) ** 2,
+                extent=_extent(L, dim),
+                origin="lower",
+                cmap="viridis",
+            )
+            ax.set_title(f"t={t:.2e}s  N={N:.3f}")
+            ax.set_xlabel("x (m)")
+            ax.set_ylabel("y (m)")
+    fig.tight_layout()
+    add_dim_label(fig, f"{dim}D")
+    return fig
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from itertools import chain, islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from .render import add_dim_label
+from .superposition import SuperpositionEvaluator
+
+
+def iter_frames(
+    evol: SuperpositionEvaluator, times: Iterable[float], chunk: int = 32
+) -> Iterator[tuple[float, np.ndarray]]:
+    """Yield (t, |psi|^2) frames, evaluating ``chunk`` times per batch.
+
+    ``times`` may be any iterable, including an unbounded generator; at most
+    one chunk of frames is alive at a time.
+    """
+    it = iter(times)
+    while True:
+        block = np.fromiter(islice(it, chunk), dtype=float)
+        if block.size == 0:
+            return
+        for t, frame in zip(block, evol.density(block)):
+            yield float(t), frame
+
+
+def write_animation(
+    frames: Iterable[tuple[float, np.ndarray]],
+    out: Path,
+    *,
+    vmax: float,
+    x: np.ndarray | None = None,
+    extent: list[float] | None = None,
+    label: str | None = None,
+    fps: int = 25,
+    dpi: int = 100,
+) -> int:
+    """Render frames one at a time to a movie or a directory of PNGs.
+
+    ``out`` ending in ``.mp4`` or ``.gif`` is written through ffmpeg, which
+    streams frames to the encoder. Without ffmpeg a ``.gif`` falls back to
+    Pillow, which keeps every encoded frame until the end. Any other path is
+    treated as a directory and receives ``frame_00000.png``, ... 1D frames
+    are drawn as a line over ``x``; 2D frames as an image over ``extent``.
+    Returns the number of frames written.
+    """
+    from matplotlib import animation
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    out = Path(out)
+    it = iter(frames)
+    first = next(it, None)
+    if first is None:
+        return 0
+    t0, f0 = first
+
+    fig = Figure(figsize=(6, 4.5) if f0.ndim > 1 else (7, 4.5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    if f0.ndim == 1:
+        (line,) = ax.plot(x, f0, color="tab:blue")
+        ax.set_ylim(0, vmax)
+        ax.set_xlabel("x (m)")
+        ax.set_ylabel("|psi|^2")
+        update = line.set_ydata
+    else:
+        im = ax.imshow(
+            f0, extent=extent, origin="lower", cmap="viridis", vmin=0, vmax=vmax
+        )
+        ax.set_xlabel("x (m)")
+        ax.set_ylabel("y (m)")
+        update = im.set_data
+    title = ax.set_title(f"t={t0:.2e}s")
+    fig.tight_layout()
+    if label:
+        add_dim_label(fig, label)
+
+    def draw(t: float, frame: np.ndarray) -> None:
+        update(frame)
+        title.set_text(f"t={t:.2e}s")
+
+    count = 0
+    if out.suffix in (".mp4", ".gif"):
+        if animation.FFMpegWriter.isAvailable():
+            writer = animation.FFMpegWriter(fps=fps)
+        elif out.suffix == ".gif":
+            writer = animation.PillowWriter(fps=fps)
+        else:
+            raise RuntimeError("writing .mp4 requires ffmpeg on PATH")
+        with writer.saving(fig, str(out), dpi):
+            for t, frame in chain([first], it):
+                draw(t, frame)
+                writer.grab_frame()
+                count += 1
+    else:
+        out.mkdir(parents=True, exist_ok=True)
+        for t, frame in chain([first], it):
+            draw(t, frame)
+            fig.savefig(out / f"frame_{count:05d}.png", dpi=dpi)
+            count += 1
+    return count
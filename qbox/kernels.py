@@ -0,0 +1,67 @@
+"""Fused |psi|^2 kernel, JIT-compiled with numba when it is installed.
+
+``density`` evaluates |sum_k a_k(t) phi_k(x)|^2 for a block of times. The
+numba kernel runs one pass over the grid points in parallel (``prange``),
+accumulating the real and imaginary sums in registers, so neither the
+complex wavefunction nor any per-mode temporary is ever stored. Without
+numba, or with ``QBOX_NUMBA=0``, two real GEMMs and an in-place square are
+used instead; that needs one extra real buffer of the output size.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+from typing import Callable
+
+import numpy as np
+
+
+@functools.cache
+def _jit() -> Callable[..., None] | None:
+    if os.environ.get("QBOX_NUMBA") == "0":
+        return None
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(parallel=True, cache=True)
+    def density(ar, ai, phi, out):  # pragma: no cover - compiled
+        nt, nk = ar.shape
+        for p in numba.prange(phi.shape[1]):
+            for t in range(nt):
+                re = 0.0
+                im = 0.0
+                for k in range(nk):
+                    f = phi[k, p]
+                    re += ar[t, k] * f
+                    im += ai[t, k] * f
+                out[t, p] = re * re + im * im
+
+    return density
+
+
+def jit_available() -> bool:
+    """Whether ``density`` runs the compiled kernel."""
+    return _jit() is not None
+
+
+def density(a: np.ndarray, phi: np.ndarray) -> np.ndarray:
+    """|a @ phi|^2 for complex amplitudes ``a`` (times x modes) and real ``phi``.
+
+    The result has the dtype of ``phi``, shape (times, points).
+    """
+    ar = np.ascontiguousarray(a.real, dtype=phi.dtype)
+    ai = np.ascontiguousarray(a.imag, dtype=phi.dtype)
+    kernel = _jit()
+    if kernel is not None:
+        out = np.empty((a.shape[0], phi.shape[1]), dtype=phi.dtype)
+        kernel(ar, ai, phi, out)
+        return out
+    out = ar @ phi
+    im = ai @ phi
+    out *= out
+    im *= im
+    out += im
+    return out
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from typing import Callable, Sequence
+
+import numpy as np
+
+from .basis import axis_lengths, sine_factor
+
+
+def norm(psi: np.ndarray, *axes: np.ndarray) -> float:
+    """Trapezoidal integral of |psi|^2 over a tensor grid.
+
+    ``axes`` are the sample points in (x, y, z) order, while ``psi`` is
+    laid out with x on its last array axis (shape (..., ny, nx)), so the
+    axes are integrated out from the last array axis inward.
+    Single-precision ``psi`` is accumulated in float64.
+    """
+    dens = np.abs(psi) ** 2
+    for a in axes:
+        dens = np.trapezoid(dens, np.asarray(a, dtype=float), axis=-1)
+    return float(dens)
+
+
+def modal_norm(coeffs: np.ndarray | Sequence[complex]) -> float:
+    """Exact norm sum(|c_k|^2) of a superposition of distinct box modes.
+
+    The modes are orthonormal and time evolution only rotates phases, so
+    this holds at every time.
+    """
+    c = np.asarray(coeffs)
+    return float(np.vdot(c, c).real)
+
+
+def _groups(rows: np.ndarray) -> tuple[np.ndarray, int]:
+    """Group index of each row of ``rows`` (equal rows share one), and the count."""
+    if rows.shape[1] == 0:
+        return np.zeros(len(rows), dtype=np.intp), 1
+    u, inv = np.unique(rows, axis=0, return_inverse=True)
+    return inv.ravel(), len(u)
+
+
+def _group_sums(values: np.ndarray, inv: np.ndarray, groups: int) -> np.ndarray:
+    out = np.zeros((groups, *values.shape[1:]), dtype=values.dtype)
+    np.add.at(out, inv, values)
+    return out
+
+
+def overlap(
+    modes_a: np.ndarray | Sequence[Sequence[int]],
+    coeffs_a: np.ndarray | Sequence[complex],
+    modes_b: np.ndarray | Sequence[Sequence[int]],
+    coeffs_b: np.ndarray | Sequence[complex],
+) -> complex:
+    """<a|b> for two superpositions of box modes, from orthonormality alone.
+
+    The modes of both states are matched by sorting their rows, so the cost
+    is O(K log K) with no K_a x K_b matrix.
+    """
+    ca = np.asarray(coeffs_a, dtype=np.complex128)
+    cb = np.asarray(coeffs_b, dtype=np.complex128)
+    ma = np.asarray(modes_a, dtype=np.int64).reshape(len(ca), -1)
+    mb = np.asarray(modes_b, dtype=np.int64).reshape(len(cb), -1)
+    inv, groups = _groups(np.concatenate([ma, mb]))
+    a = _group_sums(ca, inv[: len(ca)], groups)
+    b = _group_sums(cb, inv[len(ca) :], groups)
+    return complex(np.vdot(a, b))
+
+
+def slice_norm(
+    modes: np.ndarray | Sequence[Sequence[int]],
+    amps: np.ndarray | Sequence[complex],
+    pinned: Sequence[float | None],
+    L: float | Sequence[float],
+) -> np.ndarray | float:
+    """Exact integral of |psi|^2 over the free axes of a slice of the box.
+
+    ``pinned`` gives, per axis in (x, y, z) order, the coordinate the slice
+    is taken at, or None for an axis integrated over [0, L]; all None is
+    the full norm. ``L`` may give one length per axis. ``amps`` holds the
+    mode amplitudes, shape (K,) or (K, times) as returned by
+    ``SuperpositionEvaluator.amplitudes``.
+
+    Free axes contribute delta(n_k, n_l) and pinned axes the product of the
+    two sine factors, so the integral is the sum over groups of modes with
+    equal free quantum numbers of |sum_k a_k w_k|^2, with w_k the product of
+    the pinned factors: O(K) per time once the groups are found, with no
+    grid at all.
+    """
+    a = np.asarray(amps, dtype=np.complex128)
+    modes = np.asarray(modes, dtype=np.int64).reshape(len(a), -1)
+    lengths = axis_lengths(L, len(pinned))
+    free = [i for i, z in enumerate(pinned) if z is None]
+    w = np.ones(len(modes))
+    for i, z in enumerate(pinned):
+        if z is not None:
+            w = w * sine_factor(modes[:, i], z, lengths[i])
+    inv, groups = _groups(modes[:, free])
+    g = _group_sums(a * w.reshape(-1, *[1] * (a.ndim - 1)), inv, groups)
+    out = (g.real**2 + g.imag**2).sum(axis=0)
+    return float(out) if out.ndim == 0 else out
+
+
+def gauss_legendre_norm(
+    psi: Callable[..., np.ndarray], L: float, dim: int, points: int = 64
+) -> float:
+    """Integral of |psi|^2 over [0, L]^dim by tensor Gauss-Legendre quadrature.
+
+    For states that are not finite sums of box modes. ``psi`` receives the
+    node coordinates as arrays (X, Y, Z) in (x, y, z) order, laid out with
+    x on the last axis. Exact for polynomial |psi|^2 of degree
+    < 2 * points per axis.
+    """
+    t, w = np.polynomial.legendre.leggauss(points)
+    x, w = 0.5 * L * (t + 1.0), 0.5 * L * w
+    coords = np.meshgrid(*([x] * dim), indexing="ij")[::-1]
+    dens = np.abs(psi(*coords)) ** 2
+    for _ in range(dim):
+        dens = dens @ w
+    return float(dens)
+
+
+def simpson_norm(psi: np.ndarray, *axes: np.ndarray) -> float:
+    """Composite Simpson integral of |psi|^2 on a tensor grid (layout of ``norm``).
+
+    Fourth order for smooth states that are not mode sums; ``norm`` is
+    already exact (to rounding) for a finite sum of box modes sampled on a
+    uniform grid, but only second order otherwise.
+    """
+    from scipy.integrate import simpson
+
+    dens = np.abs(psi) ** 2
+    for a in axes:
+        dens = simpson(dens, x=a, axis=-1)
+    return float(dens)
@@ -0,0 +1,146 @@
+"""Expectation values of superposition states from closed-form matrix elements.
+
+For the 1D box basis phi_n = sqrt(2/L) sin(n pi x / L) on [0, L]:
+
+    <m|x|n>   = L/2                                    (m == n)
+              = -8 L m n / (pi^2 (m^2 - n^2)^2)        (m + n odd)
+    <m|x^2|n> = L^2 (1/3 - 1/(2 pi^2 n^2))            (m == n)
+              = (-1)^(m+n) 8 L^2 m n / (pi^2 (m^2 - n^2)^2)
+    <m|p|n>   = -i hbar 4 m n / (L (m^2 - n^2))        (m + n odd)
+    <m|p^2|n> = (n pi hbar / L)^2                      (m == n)
+
+and zero otherwise. In a box of any dimension an operator acting on axis i
+is the 1D element on that axis times delta on every other axis. The
+K x K matrices are built once; every time sample is then one small
+contraction per operator, with no grid.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+from . import units
+from .basis import axis_lengths
+from .core import box_energy
+from .superposition import amplitudes
+
+
+def position_elements(m: np.ndarray, n: np.ndarray, L: float) -> np.ndarray:
+    """<m|x|n> for broadcast arrays of 1D quantum numbers."""
+    m, n = np.broadcast_arrays(np.asarray(m, float), np.asarray(n, float))
+    d2 = (m * m - n * n) ** 2
+    odd = (m + n) % 2 == 1
+    off = -8.0 * L * m * n / (math.pi**2 * np.where(odd, d2, 1.0))
+    return np.where(m == n, 0.5 * L, np.where(odd, off, 0.0))
+
+
+def position_sq_elements(m: np.ndarray, n: np.ndarray, L: float) -> np.ndarray:
+    """<m|x^2|n> for broadcast arrays of 1D quantum numbers."""
+    m, n = np.broadcast_arrays(np.asarray(m, float), np.asarray(n, float))
+    same = m == n
+    d2 = np.where(same, 1.0, (m * m - n * n) ** 2)
+    sign = 1.0 - 2.0 * ((m + n) % 2)
+    off = sign * 8.0 * L * L * m * n / (math.pi**2 * d2)
+    diag = L * L * (1.0 / 3.0 - 1.0 / (2.0 * math.pi**2 * n * n))
+    return np.where(same, diag, off)
+
+
+def momentum_elements(m: np.ndarray, n: np.ndarray, L: float) -> np.ndarray:
+    """<m|p|n> / hbar (purely imaginary) for broadcast 1D quantum numbers."""
+    m, n = np.broadcast_arrays(np.asarray(m, float), np.asarray(n, float))
+    odd = (m + n) % 2 == 1
+    off = -4j * m * n / (L * np.where(odd, m * m - n * n, 1.0))
+    return np.where(odd, off, 0.0)
+
+
+def momentum_sq_elements(m: np.ndarray, n: np.ndarray, L: float) -> np.ndarray:
+    """<m|p^2|n> / hbar^2 for broadcast 1D quantum numbers."""
+    m, n = np.broadcast_arrays(np.asarray(m, float), np.asarray(n, float))
+    return np.where(m == n, (n * math.pi / L) ** 2, 0.0)
+
+
+class Observables:
+    """<x_i>, <x_i^2>, <p_i>, <p_i^2> and <H> of a superposition over time.
+
+    ``modes`` has one row of quantum numbers per state (x first), ``L`` the
+    box side or one length per axis, and ``coeffs`` the amplitudes at
+    t = 0; they need not be normalized, as every expectation is divided by
+    sum |c|^2. Per-axis operator matrices are stacked as (axis, K, K), so
+    each observable for T times costs one (T x K) @ (K x K) product per
+    axis.
+    """
+
+    def __init__(
+        self,
+        modes: np.ndarray | Sequence[Sequence[int]],
+        coeffs: np.ndarray | Sequence[complex],
+        m: float,
+        L: float | Sequence[float],
+    ) -> None:
+        self.modes = np.asarray(modes, dtype=np.int64).reshape(len(coeffs), -1)
+        self.coeffs = np.asarray(coeffs, dtype=np.complex128)
+        self.lengths = axis_lengths(L, self.modes.shape[1])
+        self.energies = box_energy(self.modes, m, self.lengths)
+        self.omega = self.energies / units.hbar
+        self.weight = float(np.vdot(self.coeffs, self.coeffs).real)
+        hbar = units.hbar
+        self.x = self._stack(position_elements)
+        self.x2 = self._stack(position_sq_elements)
+        self.p = self._stack(momentum_elements) * hbar
+        self.p2 = self._stack(momentum_sq_elements) * hbar**2
+
+    def _stack(self, elements) -> np.ndarray:
+        n = self.modes
+        out = []
+        for i in range(n.shape[1]):
+            others = np.delete(n, i, axis=1)
+            delta = np.all(others[:, None, :] == others[None, :, :], axis=-1)
+            L = self.lengths[i]
+            out.append(elements(n[:, None, i], n[None, :, i], L) * delta)
+        return np.stack(out)
+
+    def amplitudes(self, times: Sequence[float] | np.ndarray) -> np.ndarray:
+        """c_k exp(-i w_k t), shape (times, K); see ``superposition.amplitudes``."""
+        return amplitudes(self.coeffs, self.omega, times).T
+
+    def expect(
+        self, ops: np.ndarray, times: Sequence[float] | np.ndarray
+    ) -> np.ndarray:
+        """<a(t)|op|a(t)> / <a|a> for a stack of Hermitian (..., K, K) matrices.
+
+        Returns shape (times, ...).
+        """
+        a = self.amplitudes(times)
+        val = np.einsum("tk,...kl,tl->t...", a.conj(), ops, a, optimize=True)
+        return val.real / self.weight
+
+    def position(self, times: Sequence[float] | np.ndarray) -> np.ndarray:
+        """<x_i>(t), shape (times, dim)."""
+        return self.expect(self.x, times)
+
+    def momentum(self, times: Sequence[float] | np.ndarray) -> np.ndarray:
+        """<p_i>(t), shape (times, dim)."""
+        return self.expect(self.p, times)
+
+    def energy(self) -> float:
+        """<H>, constant in time."""
+        return float(np.abs(self.coeffs) ** 2 @ self.energies) / self.weight
+
+    def evaluate(self, times: Sequence[float] | np.ndarray) -> dict[str, np.ndarray]:
+        """Every observable at ``times``; vectors have shape (times, dim).
+
+        Keys: x, x2, p, p2, dx, dp, dxdp (the per-axis products, bounded
+        below by hbar/2) and E (<H>, constant).
+        """
+        x, x2, p, p2 = np.split(
+            self.expect(np.concatenate([self.x, self.x2, self.p, self.p2]), times),
+            4,
+            axis=1,
+        )
+        dx = np.sqrt(np.maximum(x2 - x * x, 0.0))
+        dp = np.sqrt(np.maximum(p2 - p * p, 0.0))
+        E = np.full(len(x), self.energy())
+        return dict(x=x, x2=x2, p=p, p2=p2, dx=dx, dp=dp, dxdp=dx * dp, E=E)
@@ -0,0 +1,287 @@
+"""The figure, animation and volume run shared by the 1D/2D/3D scripts."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Collection, Sequence
+
+import numpy as np
+
+from . import profiling, units
+from .basis import axis_lengths
+from .core import box_energy
+from .figures import snapshot_grids, snapshot_superposition, state_label
+from .frames import iter_frames, write_animation
+from .precision import dtypes, validate
+from .profiling import stage
+from .render import FigureJob, render
+from .spectrum import box_weights, lowest_states
+from .superposition import SuperpositionState
+from .volume import write_volume
+
+FIGURES = "qbox.figures"
+
+
+@dataclass(frozen=True)
+class BoxConfig:
+    """Parameters of one script run; see the per-dimension READMEs.
+
+    ``L`` is the side of a cube or one length per axis, (Lx, Ly, Lz), for a
+    rectangular box; equal lengths are stored as a single float. ``n_vals``
+    may list bare integers for a 1D box; they are stored as 1-tuples so
+    every dimension uses the same state layout. The volume
+    fields apply to 3D boxes only. ``precision`` ("double" or "single", see
+    ``qbox.precision``) applies to the snapshots, animation and volume;
+    ``validate_precision`` checks it against float64 before the run.
+    """
+
+    dim: int
+    L: float | Sequence[float]
+    m: float
+    nmax: int
+    coeffs: Sequence[complex]
+    n_vals: Sequence[Sequence[int] | int]
+    anim_frames: int = 0
+    anim_periods: float = 2
+    anim_file: str = "probability_density.gif"
+    workers: int | None = None
+    volume_ngrid: int = 0
+    volume_file: str = "psi_volume.npy"
+    volume_density: bool = False
+    precision: str = "double"
+    validate_precision: bool = False
+
+    def __post_init__(self) -> None:
+        dtypes(self.precision)
+        n_vals = [tuple(int(n) for n in np.atleast_1d(ns)) for ns in self.n_vals]
+        if any(len(ns) != self.dim for ns in n_vals):
+            raise ValueError(f"n_vals must hold {self.dim} quantum numbers per state")
+        if len(self.coeffs) != len(n_vals):
+            raise ValueError(
+                f"got {len(self.coeffs)} coeffs for {len(n_vals)} states in n_vals"
+            )
+        if self.volume_ngrid > 0 and self.dim != 3:
+            raise ValueError("volumes are written for 3D boxes only")
+        lengths = axis_lengths(self.L, self.dim)
+        L = lengths[0] if len(set(lengths)) == 1 else lengths
+        object.__setattr__(self, "L", L)
+        object.__setattr__(self, "n_vals", n_vals)
+        object.__setattr__(self, "coeffs", list(self.coeffs))
+
+    @property
+    def state(self) -> SuperpositionState:
+        """The superposition ``coeffs`` x ``n_vals``, as given (unnormalized)."""
+        return SuperpositionState(self.n_vals, self.coeffs)
+
+
+def figure_jobs(
+    cfg: BoxConfig,
+    pics: Path,
+    dpi: int = 200,
+    fmt: str = "png",
+    only: Collection[str] | None = None,
+) -> list[FigureJob]:
+    """Jobs for the figure set, saved as ``pics/<name>.<fmt>``.
+
+    ``only`` restricts the set to the named figures (file stems such as
+    ``energy_levels`` or ``eigenfunction_n2``).
+    """
+    lowest = lowest_states(4, box_weights(axis_lengths(cfg.L, cfg.dim)))
+    sel = [tuple(int(n) for n in ns) for ns in lowest.states]
+    m, L = cfg.m, cfg.L
+    jobs = [
+        FigureJob(
+            f"{FIGURES}:plot_energy_levels",
+            pics / "energy_levels.png",
+            dict(dim=cfg.dim, m=m, L=L, nmax=cfg.nmax),
+        ),
+        FigureJob(
+            f"{FIGURES}:plot_energy_vs_n",
+            pics / "energy_vs_n.png",
+            dict(dim=cfg.dim, m=m, L=L, nmax=cfg.nmax),
+        ),
+        FigureJob(
+            f"{FIGURES}:plot_eigenfunctions",
+            pics / "eigenfunctions.png",
+            dict(states=sel, L=L),
+        ),
+        FigureJob(
+            f"{FIGURES}:plot_density_snapshots",
+            pics / "probability_density_snapshots.png",
+            dict(
+                m=m,
+                L=L,
+                coeffs=cfg.coeffs,
+                n_vals=cfg.n_vals,
+                precision=cfg.precision,
+            ),
+        ),
+        FigureJob(
+            f"{FIGURES}:plot_psi_levels",
+            pics / "psi_levels.png",
+            dict(states=sel, m=m, L=L),
+        ),
+        FigureJob(
+            f"{FIGURES}:plot_density_levels",
+            pics / "density_levels.png",
+            dict(states=sel, m=m, L=L),
+        ),
+    ]
+    jobs += [
+        FigureJob(
+            f"{FIGURES}:plot_eigenfunction",
+            pics / f"eigenfunction_n{i}.png",
+            dict(ns=ns, L=L),
+        )
+        for i, ns in enumerate(sel, start=1)
+    ]
+    jobs = [replace(job, out=job.out.with_suffix(f".{fmt}"), dpi=dpi) for job in jobs]
+    if only is not None:
+        names = [job.out.stem for job in jobs]
+        unknown = set(only) - set(names)
+        if unknown:
+            raise ValueError(
+                f"unknown figures {sorted(unknown)}; choose from {', '.join(names)}"
+            )
+        jobs = [job for job in jobs if job.out.stem in only]
+    return jobs
+
+
+def summary(cfg: BoxConfig) -> list[str]:
+    """The ground and first excited energies, as printed after a run."""
+    ground = (1,) * cfg.dim
+    if np.ndim(cfg.L) == 0:
+        excited = (2,) + (1,) * (cfg.dim - 1)
+        size = f"L={cfg.L:.2e} m"
+    else:
+        lowest = lowest_states(2, box_weights(cfg.L)).states
+        excited = tuple(int(n) for n in lowest[1])
+        size = "L=(" + ", ".join(f"{Li:.2e}" for Li in cfg.L) + ") m"
+    E1, E2 = box_energy([ground, excited], cfg.m, cfg.L) / units.e
+    lines = [
+        f"Particle in a {cfg.dim}D infinite well",
+        f"{size}, m={cfg.m:.4e} kg",
+    ]
+    if cfg.dim == 1:
+        lines.append(f"E1={E1:.3f} eV, E2={E2:.3f} eV, E2/E1={E2/E1:.2f}")
+    else:
+        g, e = state_label(ground), state_label(excited)
+        lines.append(f"E{g}={E1:.3f} eV, E{e}={E2:.3f} eV")
+    return lines
+
+
+def run(
+    cfg: BoxConfig,
+    out: Path,
+    dpi: int = 200,
+    fmt: str = "png",
+    only: Collection[str] | None = None,
+    plots: bool = True,
+    force: bool = False,
+) -> None:
+    """Render the figures into ``out/pics`` plus the optional extras.
+
+    Figures whose file and inputs are unchanged since the last run are left
+    alone (see ``qbox.render.Manifest``); ``force`` re-renders them all,
+    without copying any from the artifact cache.
+    With ``plots=False`` no figure or animation is produced and matplotlib
+    is never imported; the numbers are still printed and the volume, if
+    configured, is still written. Each part is a profiling stage; see
+    ``qbox.profiling``.
+    """
+    print(f"Executing {cfg.dim}D version...")
+    with profiling.from_env():
+        prof = profiling.active()
+        if prof is not None:
+            prof.meta.update(
+                dim=cfg.dim, L=cfg.L, m=cfg.m, nmax=cfg.nmax, workers=cfg.workers
+            )
+        jobs, written = _run(cfg, out, dpi, fmt, only, plots, force)
+    for line in summary(cfg):
+        print(line)
+    done = set(written)
+    fresh = [job.out for job in jobs if job.out not in done]
+    if written:
+        print("Saved: " + ", ".join(_relative(path, out) for path in written))
+    if fresh:
+        print("Up to date: " + ", ".join(_relative(path, out) for path in fresh))
+
+
+def _relative(path: Path, out: Path) -> str:
+    """``path`` relative to ``out``, with a trailing slash for a frame directory."""
+    name = path.relative_to(out).as_posix()
+    return name + "/" if path.is_dir() else name
+
+
+def _run(
+    cfg: BoxConfig,
+    out: Path,
+    dpi: int,
+    fmt: str,
+    only: Collection[str] | None,
+    plots: bool,
+    force: bool,
+) -> tuple[list[FigureJob], list[Path]]:
+    jobs: list[FigureJob] = []
+    written: list[Path] = []
+    pics = out / "pics"
+    if cfg.validate_precision:
+        with stage("validate_precision"):
+            err = _validate_precision(cfg)
+        print(f"{cfg.precision} precision: max error {err:.1e} relative to float64")
+    if plots:
+        pics.mkdir(parents=True, exist_ok=True)
+        with stage("figure_jobs"):
+            jobs = figure_jobs(cfg, pics, dpi=dpi, fmt=fmt, only=only)
+        with stage("render"):
+            written = render(jobs, workers=cfg.workers, force=force)
+
+    if plots and cfg.anim_frames > 0:
+        with stage("animation"):
+            evol, T = snapshot_superposition(
+                cfg.m, cfg.L, cfg.coeffs, cfg.n_vals, cfg.precision
+            )
+            times = np.linspace(0.0, cfg.anim_periods * T, cfg.anim_frames)
+            if cfg.dim == 1:
+                where = dict(x=snapshot_grids(1, cfg.L)[0])
+            else:
+                Lx, Ly = axis_lengths(cfg.L, cfg.dim)[:2]
+                where = dict(extent=[0, Lx, 0, Ly])
+            if write_animation(
+                iter_frames(evol, times),
+                pics / cfg.anim_file,
+                vmax=evol.density_bound(),
+                label=f"{cfg.dim}D",
+                **where,
+            ):
+                written.append(pics / cfg.anim_file)
+
+    if cfg.volume_ngrid > 0:
+        with stage("volume"):
+            axes = [
+                np.linspace(0, Li, cfg.volume_ngrid) for Li in axis_lengths(cfg.L, 3)
+            ]
+            state = cfg.state.normalized()
+            (out / "data").mkdir(parents=True, exist_ok=True)
+            write_volume(
+                out / "data" / cfg.volume_file,
+                axes,
+                cfg.L,
+                state.modes,
+                state.coeffs,
+                state.energies(cfg.m, cfg.L),
+                density=cfg.volume_density,
+                precision=cfg.precision,
+            )
+    return jobs, written
+
+
+def _validate_precision(cfg: BoxConfig) -> float:
+    """Error of the snapshot wavefunctions at ``cfg.precision`` against float64."""
+    ref, T = snapshot_superposition(cfg.m, cfg.L, cfg.coeffs, cfg.n_vals)
+    approx, _ = snapshot_superposition(
+        cfg.m, cfg.L, cfg.coeffs, cfg.n_vals, cfg.precision
+    )
+    times = np.linspace(0.0, cfg.anim_periods * T, 5)
+    return validate(ref.psi(times), approx.psi(times), cfg.precision)
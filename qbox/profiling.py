@@ -0,0 +1,182 @@
+"""Opt-in per-stage timing and memory reports for pipeline runs.
+
+Code marks its stages with ``with stage("name"):``. Outside a profiling
+session that is a no-op; inside one, each stage records its wall time,
+call count and (with ``memory=True``) the peak tracemalloc usage, keyed by
+the "/"-joined path of the enclosing stages. A session writes everything as
+one JSON report, optionally with a cProfile dump and its top functions.
+
+Sessions are opened by ``session(path)``, by the CLI's ``--profile`` flag,
+or for the scripts by setting ``QBOX_PROFILE=report.json`` (plus
+``QBOX_PROFILE_MEMORY=1`` / ``QBOX_PROFILE_CPROFILE=1``).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import datetime
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, ContextManager, Iterator
+
+_NULL = contextlib.nullcontext()
+_active: Profiler | None = None
+
+
+class Profiler:
+    """Aggregated stage records of one run."""
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.stages: dict[str, dict[str, float]] = {}
+        self.meta: dict[str, Any] = {}
+        self._stack: list[list[Any]] = []
+
+    def path(self, name: str = "") -> str:
+        return "/".join([*(entry[0] for entry in self._stack), name]).strip("/")
+
+    def add(
+        self, path: str, seconds: float, peak: float | None = None, calls: int = 1
+    ) -> None:
+        rec = self.stages.setdefault(path, {"seconds": 0.0, "calls": 0})
+        rec["seconds"] += seconds
+        rec["calls"] += calls
+        if peak is not None:
+            rec["peak_mib"] = max(rec.get("peak_mib", 0.0), peak / 2**20)
+
+    def merge(self, stages: dict[str, dict[str, float]], prefix: str) -> None:
+        """Fold in records from another process under ``prefix``."""
+        base = self.path(prefix)
+        for name, rec in stages.items():
+            peak = rec.get("peak_mib")
+            self.add(
+                f"{base}/{name}",
+                rec["seconds"],
+                None if peak is None else peak * 2**20,
+                int(rec["calls"]),
+            )
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        entry = [name, 0]
+        if self.memory:
+            # Fold the running peak into the parent before resetting it.
+            if self._stack:
+                self._stack[-1][1] = max(
+                    self._stack[-1][1], tracemalloc.get_traced_memory()[1]
+                )
+            tracemalloc.reset_peak()
+        path = self.path(name)
+        self._stack.append(entry)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - t0
+            self._stack.pop()
+            peak = None
+            if self.memory:
+                peak = max(entry[1], tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+            self.add(path, seconds, peak)
+
+    def report(self) -> dict[str, Any]:
+        return {"meta": self.meta, "stages": self.stages}
+
+
+def active() -> Profiler | None:
+    return _active
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time ``name`` if a session is active; otherwise do nothing."""
+    return _NULL if _active is None else _active.stage(name)
+
+
+@contextlib.contextmanager
+def collect(memory: bool = False) -> Iterator[Profiler]:
+    """Record stages of the enclosed block into a fresh profiler.
+
+    Nothing is written; worker processes use this and send ``stages`` back.
+    """
+    global _active
+    prof, previous = Profiler(memory), _active
+    _active = prof
+    if memory:
+        tracemalloc.start()
+    try:
+        yield prof
+    finally:
+        if memory:
+            prof.meta["peak_mib"] = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        _active = previous
+
+
+@contextlib.contextmanager
+def session(
+    path: str | Path, memory: bool = False, cprofile: bool = False, top: int = 25
+) -> Iterator[Profiler]:
+    """Profile the enclosed block and write the JSON report to ``path``.
+
+    With ``cprofile`` the raw profile is saved next to the report as
+    ``.prof`` and the ``top`` functions by cumulative time are embedded.
+    """
+    cp = cProfile.Profile() if cprofile else None
+    started = datetime.datetime.now().astimezone().isoformat(timespec="seconds")
+    t0 = time.perf_counter()
+    with collect(memory) as prof:
+        if cp is not None:
+            cp.enable()
+        try:
+            yield prof
+        finally:
+            if cp is not None:
+                cp.disable()
+    report = {
+        "started": started,
+        "total_s": time.perf_counter() - t0,
+        **prof.report(),
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if cp is not None:
+        dump = path.with_suffix(".prof")
+        cp.dump_stats(dump)
+        report["cprofile"] = {"file": str(dump), "top": _top(cp, top)}
+    path.write_text(json.dumps(report, indent=1))
+
+
+def _top(cp: cProfile.Profile, n: int) -> list[dict[str, Any]]:
+    stats = pstats.Stats(cp, stream=io.StringIO())
+    rows = []
+    for (file, line, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append(
+            {
+                "function": f"{file}:{line}({func})",
+                "calls": ncalls,
+                "tottime_s": tottime,
+                "cumtime_s": cumtime,
+            }
+        )
+    rows.sort(key=lambda r: r["cumtime_s"], reverse=True)
+    return rows[:n]
+
+
+def from_env() -> ContextManager[Profiler | None]:
+    """A session configured by ``QBOX_PROFILE*``, unless one is already open."""
+    path = os.environ.get("QBOX_PROFILE")
+    if not path or _active is not None:
+        return _NULL
+    return session(
+        path,
+        memory=os.environ.get("QBOX_PROFILE_MEMORY") == "1",
+        cprofile=os.environ.get("QBOX_PROFILE_CPROFILE") == "1",
+    )
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Sequence
+
+from . import profiling
+from .cache import code_digest, default_cache, digest
+from .profiling import stage
+
+
+@dataclass(frozen=True)
+class FigureJob:
+    """One figure to build and save.
+
+    ``target`` names the builder as ``"package.module:func"`` or
+    ``"/path/to/script.py:func"``; the builder is called with ``kwargs`` and
+    must return a ``matplotlib.figure.Figure``. Jobs hold only picklable data
+    so they can be shipped to worker processes.
+    """
+
+    target: str
+    out: Path
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    dpi: int = 200
+
+
+def add_dim_label(fig, label: str) -> None:
+    """Stamp a small dimension label at the top of ``fig``."""
+    fig.text(0.01, 0.985, label, ha="left", va="top", fontsize=12, fontweight="bold")
+
+
+def load_script(path: str | Path) -> ModuleType:
+    """Import a script by file path under a stable, unique module name."""
+    path = Path(path).resolve()
+    name = "_qbox_script_" + hashlib.sha1(str(path).encode()).hexdigest()[:12]
+    mod = sys.modules.get(name)
+    if mod is None:
+        spec = importlib.util.spec_from_file_location(name, path)
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[name] = mod
+        spec.loader.exec_module(mod)
+    return mod
+
+
+def resolve(target: str) -> Callable[..., Any]:
+    where, _, func = target.rpartition(":")
+    if where.endswith(".py"):
+        mod = load_script(where)
+    else:
+        mod = importlib.import_module(where)
+    return getattr(mod, func)
+
+
+def run_job(job: FigureJob) -> Path:
+    with stage("build"):
+        fig = resolve(job.target)(**job.kwargs)
+    job.out.parent.mkdir(parents=True, exist_ok=True)
+    with stage("savefig"):
+        fig.savefig(job.out, dpi=job.dpi)
+    return job.out
+
+
+def _profiled_job(job: FigureJob, memory: bool) -> dict[str, dict[str, float]]:
+    """Run ``job`` in a worker and return its stage records."""
+    with profiling.collect(memory) as prof:
+        run_job(job)
+    return prof.stages
+
+
+MANIFEST = ".qbox-manifest.json"
+
+
+def job_inputs(job: FigureJob) -> dict[str, str]:
+    """Digest of each input a job's output depends on, by name.
+
+    The inputs are the builder (its module and every qbox module that
+    module imports, see ``module_closure``), each keyword argument and the
+    resolution; the file format is part of the output name.
+    """
+    where, _, func = job.target.rpartition(":")
+    origin = where if where.endswith(".py") else importlib.util.find_spec(where).origin
+    inputs = {"code": digest(func, code_digest(str(origin))), "dpi": digest(job.dpi)}
+    inputs.update((k, digest(v)) for k, v in job.kwargs.items())
+    return inputs
+
+
+def job_key(job: FigureJob) -> str:
+    """Content hash of everything that determines a job's output file."""
+    return digest(job.out.suffix, job_inputs(job))
+
+
+class Manifest:
+    """Inputs of the files last written into one directory.
+
+    Stored as ``<directory>/.qbox-manifest.json``: per file name, the digest
+    of each input (``job_inputs``) and the file's size and mtime. A job is
+    up to date when its file is unchanged on disk and every input matches,
+    so it can be skipped without rendering or copying anything.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.path = Path(directory) / MANIFEST
+        try:
+            self.entries: dict[str, dict[str, Any]] = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def stale(self, job: FigureJob) -> list[str]:
+        """Why ``job`` must be rendered: changed input names, or [] if up to date."""
+        entry = self.entries.get(job.out.name)
+        if entry is None:
+            return ["new"]
+        try:
+            st = job.out.stat()
+        except OSError:
+            return ["missing"]
+        if [st.st_size, st.st_mtime_ns] != entry["stat"]:
+            return ["modified"]
+        old, new = entry["inputs"], job_inputs(job)
+        return sorted(k for k in old.keys() | new.keys() if old.get(k) != new.get(k))
+
+    def record(self, job: FigureJob) -> None:
+        st = job.out.stat()
+        self.entries[job.out.name] = {
+            "inputs": job_inputs(job),
+            "stat": [st.st_size, st.st_mtime_ns],
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def render(
+    jobs: Sequence[FigureJob],
+    workers: int | None = None,
+    use_cache: bool = True,
+    incremental: bool = True,
+    force: bool = False,
+) -> list[Path]:
+    """Build and save the jobs that are out of date, over a process pool.
+
+    With ``incremental`` a job whose output file and inputs are unchanged
+    since it was last written (see ``Manifest``) is skipped. Of the rest,
+    jobs whose inputs match any earlier run are copied from the artifact
+    cache, and only the remainder are rendered. ``force`` renders every
+    job, skipping both checks, but still records the results in the
+    manifest and the cache. ``workers`` defaults to the CPU count; 1
+    renders in-process. Returns the paths written.
+    """
+    manifests: dict[Path, Manifest] = {}
+    dirty = list(jobs)
+    if incremental:
+        with stage("manifest"):
+            for job in jobs:
+                if job.out.parent not in manifests:
+                    manifests[job.out.parent] = Manifest(job.out.parent)
+            if not force:
+                dirty = [job for job in jobs if manifests[job.out.parent].stale(job)]
+    cache = default_cache() if use_cache else None
+    todo = dirty
+    keys: list[str] = []
+    if cache is not None:
+        with stage("cache_lookup"):
+            keys = [job_key(job) for job in dirty]
+            if not force:
+                todo = [
+                    job
+                    for job, key in zip(dirty, keys)
+                    if not cache.get_file(key, job.out.suffix, job.out)
+                ]
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    prof = profiling.active()
+    if workers <= 1:
+        for job in todo:
+            with stage(job.out.stem):
+                run_job(job)
+    elif prof is None:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run_job, todo))
+    else:
+        with stage("pool"), ProcessPoolExecutor(max_workers=workers) as pool:
+            profiled = partial(_profiled_job, memory=prof.memory)
+            for job, stages in zip(todo, pool.map(profiled, todo)):
+                prof.merge(stages, job.out.stem)
+    if cache is not None and todo:
+        rendered = {id(job) for job in todo}
+        for job, key in zip(dirty, keys):
+            if id(job) in rendered:
+                cache.put_file(key, job.out.suffix, job.out)
+        cache.evict()
+    if incremental and dirty:
+        for job in dirty:
+            manifests[job.out.parent].record(job)
+        for manifest in manifests.values():
+            manifest.save()
+    return [job.out for job in dirty]
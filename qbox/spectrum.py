@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import functools
+import heapq
+import math
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Sequence
+
+import numpy as np
+
+from . import units
+
+# Relative gap below which levels of a rectangular box count as degenerate.
+LEVEL_RTOL = 1e-9
+# Largest denominator tried when writing box weights as exact fractions.
+MAX_DENOMINATOR = 1000
+
+
+@functools.cache
+def _half_pi2_hbar2() -> float:
+    return (math.pi * units.hbar) ** 2 / 2.0
+
+
+def energy_unit(m: float | np.ndarray, L: float | np.ndarray) -> float | np.ndarray:
+    """pi^2 hbar^2 / (2 m L^2): the energy of one unit of sum(n_i^2), in joules.
+
+    ``m`` and ``L`` broadcast against each other; pi^2 hbar^2 / 2 is
+    computed once per process.
+    """
+    if np.ndim(m) or np.ndim(L):
+        m, L = np.asarray(m, dtype=float), np.asarray(L, dtype=float)
+    return _half_pi2_hbar2() / (m * L * L)
+
+
+def isqrt(a: np.ndarray) -> np.ndarray:
+    """Elementwise floor(sqrt(a)) for non-negative integer arrays, exact."""
+    a = np.asarray(a, dtype=np.int64)
+    r = np.sqrt(a).astype(np.int64)
+    r -= r * r > a
+    r += (r + 1) * (r + 1) <= a
+    return r
+
+
+def integer_weights(
+    weights: Sequence[float], rtol: float = LEVEL_RTOL
+) -> tuple[np.ndarray, int] | None:
+    """Integers q and d with ``weights ~= q / d``, or None if incommensurate.
+
+    Each weight is approximated by a fraction with denominator at most
+    ``MAX_DENOMINATOR`` and accepted when within ``rtol``; then
+    d * s = sum(q_i n_i^2) is an integer for every state, as in a cube
+    (q = 1, d = 1). Boxes such as L = (1, 3) or (1, 1.5) qualify.
+    """
+    fracs = [Fraction(float(w)).limit_denominator(MAX_DENOMINATOR) for w in weights]
+    if any(abs(float(f) - w) > rtol * abs(w) for f, w in zip(fracs, weights)):
+        return None
+    d = math.lcm(*(f.denominator for f in fracs))
+    return np.array([f.numerator * (d // f.denominator) for f in fracs]), d
+
+
+def box_weights(lengths: Sequence[float]) -> np.ndarray:
+    """Per-axis weights (L_x / L_i)^2 of a rectangular box.
+
+    With them ``s = sum(w_i n_i^2)`` is the energy in units of
+    pi^2 hbar^2 / (2 m L_x^2), so ``energy_unit(m, L_x)`` still applies.
+    """
+    L = np.asarray(lengths, dtype=float)
+    return (L[0] / L) ** 2
+
+
+@dataclass(frozen=True)
+class Spectrum:
+    """Box states sorted by energy.
+
+    ``states`` has one row of quantum numbers per state, ordered by
+    ``s = sum(w_i n_i^2)`` (energy in units of pi^2 hbar^2 / 2 m L^2; the
+    weights are 1 for a cube, see ``box_weights`` otherwise) and then
+    lexicographically. ``levels``, ``degeneracy`` and ``offsets`` index the
+    distinct energies: level ``i`` owns
+    ``states[offsets[i]:offsets[i] + degeneracy[i]]``. With ``rtol > 0``
+    consecutive states closer than ``rtol * s`` share a level, which groups
+    the accidental near-degeneracies of a rectangular box; ``levels`` then
+    holds the lowest ``s`` of each group.
+    """
+
+    states: np.ndarray
+    s: np.ndarray
+    levels: np.ndarray
+    degeneracy: np.ndarray
+    offsets: np.ndarray
+    rtol: float = 0.0
+
+    @classmethod
+    def from_states(
+        cls,
+        states: np.ndarray,
+        weights: Sequence[float] | None = None,
+        rtol: float = 0.0,
+    ) -> Spectrum:
+        states = np.asarray(states, dtype=np.int64).reshape(len(states), -1)
+        if weights is None:
+            s = np.sum(states * states, axis=1)
+        else:
+            s = (states * states) @ np.asarray(weights, dtype=float)
+        order = np.lexsort((*states.T[::-1], s))
+        return cls._sorted(states[order], s[order], rtol)
+
+    @classmethod
+    def _sorted(cls, states: np.ndarray, s: np.ndarray, rtol: float = 0.0) -> Spectrum:
+        if rtol == 0.0:
+            levels, offsets, degeneracy = np.unique(
+                s, return_index=True, return_counts=True
+            )
+        else:
+            split = np.diff(s) > rtol * np.abs(s[1:])
+            offsets = np.flatnonzero(np.concatenate([[True], split]))
+            degeneracy = np.diff(np.append(offsets, len(s)))
+            levels = s[offsets]
+        return cls(states, s, levels, degeneracy, offsets, rtol)
+
+    def grouped(self, rtol: float) -> Spectrum:
+        """The same states with levels regrouped at tolerance ``rtol``."""
+        return Spectrum._sorted(self.states, self.s, rtol)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    @property
+    def dim(self) -> int:
+        return self.states.shape[1]
+
+    def head(self, k: int) -> Spectrum:
+        """The ``k`` lowest states."""
+        return Spectrum._sorted(self.states[:k], self.s[:k], self.rtol)
+
+    def level_states(self, i: int) -> np.ndarray:
+        start = self.offsets[i]
+        return self.states[start : start + self.degeneracy[i]]
+
+    def energies(self, m: float, L: float) -> np.ndarray:
+        """Energy of every state in joules for mass ``m`` and box length ``L``."""
+        return self.s * energy_unit(m, L)
+
+
+def states_below(dim: int, smax: int) -> np.ndarray:
+    """All n in {1, 2, ...}^dim with sum(n_i^2) <= smax, unsorted.
+
+    Built one axis at a time: each prefix with partial sum p is extended by
+    every last index up to isqrt(smax - p), so the work is proportional to
+    the number of states returned rather than to a cube of candidates.
+    """
+    rest = dim - 1
+    states = np.arange(1, isqrt(max(smax - rest, 0)) + 1, dtype=np.int64)[:, None]
+    for _ in range(dim - 1):
+        rest -= 1
+        p = np.sum(states * states, axis=1)
+        counts = isqrt(np.maximum(smax - rest - p, 0))
+        keep = counts > 0
+        states, counts = states[keep], counts[keep]
+        starts = np.cumsum(counts) - counts
+        last = np.arange(counts.sum(), dtype=np.int64) - np.repeat(starts, counts) + 1
+        states = np.column_stack([np.repeat(states, counts, axis=0), last])
+    return states
+
+
+def spectrum(dim: int, smax: int) -> Spectrum:
+    """Every state with sum(n_i^2) <= smax."""
+    return Spectrum.from_states(states_below(dim, smax))
+
+
+def first_states(dim: int, k: int) -> Spectrum:
+    """The ``k`` lowest states, ties broken lexicographically.
+
+    The energy cutoff starts from the Weyl estimate of the k-th level and
+    grows until at least ``k`` states lie below it. The last level may be
+    cut part-way through its degenerate states.
+    """
+    ball = math.pi ** (dim / 2) / math.gamma(dim / 2 + 1) / 2**dim
+    smax = max(dim, int((k / ball) ** (2 / dim)) + dim)
+    while True:
+        states = states_below(dim, smax)
+        if len(states) >= k:
+            break
+        smax = int(smax * 1.5) + 1
+    return Spectrum.from_states(states).head(k)
+
+
+def lowest_states(k: int, weights: Sequence[float], rtol: float = 0.0) -> Spectrum:
+    """The ``k`` lowest states of ``s = sum(w_i n_i^2)``, ties lexicographic.
+
+    A best-first walk over the quantum-number lattice: the heap starts at
+    (1, ..., 1) and every popped state pushes its successors n + e_j for
+    each axis j at or after its last axis with n_j > 1, which reaches every
+    state exactly once and only after a lower-energy predecessor. The cost
+    is O(k dim log k) however elongated the box, where ``first_states``
+    would enumerate every state below a cutoff sized for the worst axis.
+    """
+    w = [float(x) for x in weights]
+    dim = len(w)
+    heap = [(sum(w), (1,) * dim)]
+    states = np.empty((k, dim), dtype=np.int64)
+    s = np.empty(k)
+    for i in range(k):
+        si, ns = heapq.heappop(heap)
+        states[i], s[i] = ns, si
+        last = max((j for j in range(dim) if ns[j] > 1), default=0)
+        for j in range(last, dim):
+            child = ns[:j] + (ns[j] + 1,) + ns[j + 1 :]
+            heapq.heappush(heap, (sum(wi * n * n for wi, n in zip(w, child)), child))
+    return Spectrum._sorted(states, s, rtol)
+
+
+def cube_states(
+    dim: int,
+    nmax: int,
+    weights: Sequence[float] | None = None,
+    rtol: float = 0.0,
+) -> Spectrum:
+    """States with every n_i <= nmax, as enumerated by the scripts' NMAX."""
+    grids = np.indices((nmax,) * dim).reshape(dim, -1).T + 1
+    return Spectrum.from_states(grids, weights, rtol)
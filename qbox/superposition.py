@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from . import kernels, units
+from .basis import SeparableBasis, axis_lengths
+from .core import box_energy
+from .spectrum import (
+    LEVEL_RTOL,
+    Spectrum,
+    box_weights,
+    energy_unit,
+    integer_weights,
+)
+
+# Period used when a state has fewer than two populated levels (s).
+NOMINAL_PERIOD = 4e-15
+# Largest mode matrix SuperpositionState.evaluator builds densely.
+DENSE_BYTES = 64 * 2**20
+
+
+def amplitudes(
+    coeffs: np.ndarray, omega: np.ndarray, times: Sequence[float] | np.ndarray
+) -> np.ndarray:
+    """Time-dependent mode amplitudes c_k exp(-i w_k t), shape (modes, times)."""
+    t = np.asarray(times, dtype=float)
+    return coeffs[:, None] * np.exp(-1j * np.outer(omega, t))
+
+
+class SuperpositionEvaluator:
+    """Time evolution of a superposition of box eigenmodes on a fixed grid.
+
+    psi(x, t) = sum_k c_k phi_k(x) exp(-i E_k t / hbar). The mode matrix
+    phi (modes x points) is built once; a vector of times then costs one
+    (times x modes) @ (modes x points) product instead of a Python loop over
+    times and modes.
+
+    The grid-sized arrays take the precision of ``basis.dtype``: a float32
+    basis gives complex64 wavefunctions. Amplitudes are computed in double
+    precision and rounded only for the product.
+    """
+
+    def __init__(
+        self,
+        basis: SeparableBasis,
+        modes: Sequence[Sequence[int]],
+        coeffs: Sequence[complex],
+        energies: Sequence[float],
+    ) -> None:
+        if not len(modes) == len(coeffs) == len(energies):
+            raise ValueError("modes, coeffs and energies must have equal length")
+        self.shape = basis.shape
+        self.phi = basis.matrix(modes)
+        self.coeffs = np.asarray(coeffs, dtype=np.complex128)
+        self.omega = np.asarray(energies, dtype=float) / units.hbar
+
+    def amplitudes(self, times: Sequence[float] | np.ndarray) -> np.ndarray:
+        return amplitudes(self.coeffs, self.omega, times)
+
+    def psi(self, times: Sequence[float] | np.ndarray) -> np.ndarray:
+        """Wavefunction for every time, shape (len(times), *basis.shape)."""
+        a = self.amplitudes(times)
+        real = self.phi.dtype
+        out = np.empty(
+            (a.shape[1], self.phi.shape[1]), dtype=np.result_type(real, np.complex64)
+        )
+        # phi is real: two real GEMMs avoid upcasting the mode matrix.
+        out.real = a.real.T.astype(real) @ self.phi
+        out.imag = a.imag.T.astype(real) @ self.phi
+        return out.reshape((a.shape[1], *self.shape))
+
+    def density_bound(self) -> float:
+        """Upper bound on |psi|^2 over all times, for fixed colour scales."""
+        return float(np.abs(self.coeffs) @ np.abs(self.phi).max(axis=1)) ** 2
+
+    def density(self, times: Sequence[float] | np.ndarray) -> np.ndarray:
+        """|psi|^2 for every time, shape (len(times), *basis.shape).
+
+        Evaluated by the fused ``qbox.kernels.density`` without forming psi.
+        """
+        a = self.amplitudes(times)
+        return kernels.density(a.T, self.phi).reshape((a.shape[1], *self.shape))
+
+
+class FactoredEvaluator:
+    """``SuperpositionEvaluator`` for states with many modes, without a mode matrix.
+
+    The amplitudes (times any pinned-axis factors) are scattered into a
+    small coefficient tensor over the distinct quantum numbers of each
+    sampled axis, which is then contracted with one sine table per axis,
+    e.g. psi(t) = Fy^T C(t) Fx on a plane. Memory is the per-axis tables
+    plus one (times, *shape) result, and the cost grows with the number of
+    distinct quantum numbers per axis rather than with modes x points.
+    """
+
+    def __init__(
+        self,
+        basis: SeparableBasis,
+        modes: Sequence[Sequence[int]] | np.ndarray,
+        coeffs: Sequence[complex],
+        energies: Sequence[float],
+    ) -> None:
+        modes = np.asarray(modes, dtype=np.int64).reshape(len(coeffs), -1)
+        if not len(modes) == len(energies):
+            raise ValueError("modes, coeffs and energies must have equal length")
+        self.shape = basis.shape
+        self.coeffs = np.asarray(coeffs, dtype=np.complex128)
+        self.omega = np.asarray(energies, dtype=float) / units.hbar
+        self.dtype = np.result_type(basis.dtype, np.complex64)
+        # Pinned axes reduce to one scalar factor per mode.
+        self.weight = np.ones(len(modes))
+        self.peak = np.ones(len(modes))
+        index, self.tables = [], []
+        for i in reversed(range(basis.ndim)):
+            u, inv = np.unique(modes[:, i], return_inverse=True)
+            table = basis.table(i, u)
+            if basis.axes[i].ndim == 0:
+                self.weight *= table[inv]
+                continue
+            self.peak *= np.abs(table).max(axis=1)[inv]
+            index.append(inv)
+            self.tables.append(table)
+        self.dims = tuple(len(t) for t in self.tables)
+        self.flat = np.ravel_multi_index(tuple(index), self.dims)
+
+    def amplitudes(self, times: Sequence[float] | np.ndarray) -> np.ndarray:
+        return amplitudes(self.coeffs, self.omega, times)
+
+    def psi(self, times: Sequence[float] | np.ndarray) -> np.ndarray:
+        """Wavefunction for every time, shape (len(times), *basis.shape)."""
+        a = self.amplitudes(times)
+        C = np.zeros((a.shape[1], math.prod(self.dims)), dtype=self.dtype)
+        np.add.at(C, (slice(None), self.flat), (a * self.weight[:, None]).T)
+        out = C.reshape(a.shape[1], *self.dims)
+        for j, table in enumerate(self.tables, start=1):
+            out = np.moveaxis(np.moveaxis(out, j, -1) @ table, -1, j)
+        return out
+
+    def density_bound(self) -> float:
+        """Upper bound on |psi|^2 over all times, for fixed colour scales."""
+        return float(np.abs(self.coeffs * self.weight) @ self.peak) ** 2
+
+    def density(self, times: Sequence[float] | np.ndarray) -> np.ndarray:
+        """|psi|^2 for every time, shape (len(times), *basis.shape)."""
+        p = self.psi(times)
+        return p.real**2 + p.imag**2
+
+
+@dataclass(frozen=True)
+class Timescales:
+    """Beat periods of a superposition in seconds (None where undefined).
+
+    ``revival`` is the exact recurrence time of |psi|^2, which exists when
+    every energy is an integer multiple of a common unit, as in a cube;
+    ``slowest`` and ``fastest`` are the longest and shortest beat periods.
+    """
+
+    revival: float | None
+    slowest: float | None
+    fastest: float | None
+
+
+class SuperpositionState:
+    """Quantum numbers ``modes`` (K, dim) and complex ``coeffs`` (K,) of a state.
+
+    Array-backed, so states of thousands of modes stay compact; the
+    coefficients are used as given (see ``normalized``).
+    """
+
+    __slots__ = ("modes", "coeffs")
+
+    def __init__(
+        self,
+        modes: Sequence[Sequence[int] | int] | np.ndarray,
+        coeffs: Sequence[complex] | np.ndarray,
+    ) -> None:
+        coeffs = np.asarray(coeffs, dtype=np.complex128).ravel()
+        modes = np.asarray(modes, dtype=np.int64)
+        if modes.ndim != 2:
+            modes = modes.reshape(len(coeffs), -1)
+        if len(modes) != len(coeffs):
+            raise ValueError("modes and coeffs must have equal length")
+        self.modes = modes
+        self.coeffs = coeffs
+
+    def __len__(self) -> int:
+        return len(self.coeffs)
+
+    def __repr__(self) -> str:
+        return f"SuperpositionState({len(self)} modes, dim={self.dim})"
+
+    @property
+    def dim(self) -> int:
+        return self.modes.shape[1]
+
+    def normalized(self) -> SuperpositionState:
+        return SuperpositionState(
+            self.modes, self.coeffs / np.sqrt(np.vdot(self.coeffs, self.coeffs).real)
+        )
+
+    def populated(self, tol: float = 1e-12) -> SuperpositionState:
+        """The modes whose |c| exceeds ``tol`` times the norm."""
+        norm = np.sqrt(np.vdot(self.coeffs, self.coeffs).real)
+        keep = np.abs(self.coeffs) > tol * norm
+        return SuperpositionState(self.modes[keep], self.coeffs[keep])
+
+    def energies(self, m: float, L: float | Sequence[float]) -> np.ndarray:
+        return box_energy(self.modes, m, L)
+
+    def timescales(self, m: float, L: float | Sequence[float]) -> Timescales:
+        """Beat periods over every pair of populated levels.
+
+        Only the distinct populated levels matter, grouped at ``LEVEL_RTOL``
+        so that accidental degeneracies of a rectangular box, equal in
+        theory but apart by rounding, do not beat: the slowest beat is
+        2 pi hbar over their smallest gap and the fastest over their
+        spread. When the box weights are commensurate (a cube, or e.g.
+        L = (1, 3)), d * s is an integer and the revival is
+        2 pi hbar * d / (gcd(delta d s) * energy_unit), all in O(K log K).
+        """
+        state = self.populated()
+        lengths = axis_lengths(L, state.dim)
+        weights = box_weights(lengths)
+        spec = Spectrum.from_states(state.modes, weights, LEVEL_RTOL)
+        if len(spec.levels) < 2:
+            return Timescales(None, None, None)
+        h = 2 * math.pi * units.hbar
+        unit = energy_unit(m, lengths[0])
+        E = spec.levels * unit
+        revival = None
+        exact = integer_weights(weights)
+        if exact is not None:
+            q, d = exact
+            s = np.unique((state.modes * state.modes) @ q)
+            revival = float(h * d / (int(np.gcd.reduce(np.diff(s))) * unit))
+        return Timescales(
+            revival, float(h / np.diff(E).min()), float(h / (E[-1] - E[0]))
+        )
+
+    def period(self, m: float, L: float | Sequence[float]) -> float:
+        """The time scale of the time-evolution figures.
+
+        The revival period where there is one, else the slowest beat; with
+        fewer than two populated levels there is no beat and a nominal
+        ``NOMINAL_PERIOD`` keeps time axes finite.
+        """
+        ts = self.timescales(m, L)
+        if ts.revival is not None:
+            return ts.revival
+        return ts.slowest if ts.slowest is not None else NOMINAL_PERIOD
+
+    def evaluator(
+        self, basis: SeparableBasis, m: float, L: float | Sequence[float]
+    ) -> SuperpositionEvaluator | FactoredEvaluator:
+        """An evaluator of this state on ``basis``.
+
+        The dense mode matrix is used while it fits in ``DENSE_BYTES``
+        (fastest for a few modes, one GEMM per batch of times); larger
+        states use ``FactoredEvaluator``.
+        """
+        E = self.energies(m, L)
+        points = math.prod(basis.shape)
+        if len(self) * points * basis.dtype.itemsize <= DENSE_BYTES:
+            modes = [tuple(int(n) for n in ns) for ns in self.modes]
+            return SuperpositionEvaluator(basis, modes, self.coeffs, E)
+        return FactoredEvaluator(basis, self.modes, self.coeffs, E)
+
+
+def superposition(
+    basis: SeparableBasis,
+    modes: Sequence[Sequence[int]],
+    coeffs: Sequence[complex],
+    m: float,
+    L: float | Sequence[float],
+) -> tuple[SuperpositionEvaluator | FactoredEvaluator, float]:
+    """Normalized superposition of box ``modes`` on ``basis`` and its period.
+
+    See ``SuperpositionState.evaluator`` and ``SuperpositionState.period``.
+    """
+    state = SuperpositionState(modes, coeffs).normalized()
+    return state.evaluator(basis, m, L), state.period(m, L)
@@ -0,0 +1,144 @@
+"""Parameter sweeps over ``BoxConfig`` fields, spread over a process pool."""
+
+from __future__ import annotations
+
+import csv
+import dataclasses
+import functools
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+from . import units
+from .basis import SeparableBasis
+from .core import energy
+from .figures import snapshot_grids
+from .norms import norm
+from .pipeline import BoxConfig, figure_jobs
+from .render import render
+from .superposition import SuperpositionState, amplitudes
+
+
+def points(base: BoxConfig, grid: Mapping[str, Sequence[Any]]) -> list[BoxConfig]:
+    """One config per combination of ``grid`` values, last key varying fastest."""
+    keys = list(grid)
+    return [
+        dataclasses.replace(base, **dict(zip(keys, values)))
+        for values in itertools.product(*grid.values())
+    ]
+
+
+@functools.lru_cache(maxsize=16)
+def _unit_modes(
+    dim: int, ngrid: int | None, modes: tuple[tuple[int, ...], ...]
+) -> tuple[list[np.ndarray], tuple[int, ...], np.ndarray]:
+    # Sampled on the unit box: for a box of length L the same points are
+    # u * L and the modes only pick up a factor L^(-dim/2), so the integral
+    # of |psi|^2 over the sampled axes scales as L^(len(axes) - dim). One
+    # table then serves every L in a sweep.
+    grids = snapshot_grids(dim, 1.0, ngrid)
+    basis = SeparableBasis(grids, 1.0)
+    axes = [g for g in grids if np.ndim(g)]
+    return axes, basis.shape, basis.matrix(modes)
+
+
+def _evaluate(
+    task: tuple[int, int | None, float, float, list[complex], list[tuple[int, ...]]],
+) -> tuple[float, float, float, float]:
+    dim, ngrid, m, L, coeffs, n_vals = task
+    state = SuperpositionState(n_vals, coeffs).normalized()
+    T = state.period(m, L)
+    axes, shape, phi = _unit_modes(dim, ngrid, tuple(n_vals))
+    a = amplitudes(
+        state.coeffs, state.energies(m, L) / units.hbar, [0.0, 0.25 * T, 0.5 * T]
+    )
+    psi = (a.T @ phi).reshape(-1, *shape)
+    scale = L ** (len(axes) - dim)
+    return (T, *(norm(p, *axes) * scale for p in psi))
+
+
+def sweep(
+    base: BoxConfig,
+    grid: Mapping[str, Sequence[Any]],
+    workers: int | None = None,
+    ngrid: int | None = None,
+    figures: str | Path | None = None,
+) -> dict[str, np.ndarray]:
+    """Evaluate every point of ``grid`` and return the results as columns.
+
+    ``grid`` maps ``BoxConfig`` field names (``L``, ``m``, ``coeffs``, ...)
+    to the values to try; unlisted fields come from ``base``. Each point
+    reports the ground and first excited energies (eV), the period of its
+    superposition (s; see ``SuperpositionState.period``) and the norm of
+    the snapshot states at t = 0, T/4 and T/2 on an ``ngrid`` grid
+    (default: the snapshot figure's). Energies for all points are one array
+    expression; the snapshots are spread over ``workers`` processes
+    (default: one per CPU; 1 runs in-process). With ``figures`` set, point
+    ``i`` also renders the full figure set into ``figures/<i>/``.
+    """
+    cfgs = points(base, grid)
+    if any(np.ndim(cfg.L) for cfg in cfgs):
+        raise ValueError("sweeps support cubic boxes (a scalar L) only")
+    columns: dict[str, np.ndarray] = {}
+    for key in grid:
+        values = [getattr(cfg, key) for cfg in cfgs]
+        if all(np.ndim(v) == 0 for v in values):
+            columns[key] = np.asarray(values)
+        else:
+            columns[key] = np.asarray([str(v) for v in values])
+
+    dim = base.dim
+    states = np.array([(1,) * dim, (2,) + (1,) * (dim - 1)])
+    m = np.array([cfg.m for cfg in cfgs])
+    L = np.array([cfg.L for cfg in cfgs])
+    E = energy(states[:, None], m, L) / units.e
+    columns["E_ground"], columns["E_excited"] = E
+
+    tasks = [(dim, ngrid, cfg.m, cfg.L, cfg.coeffs, cfg.n_vals) for cfg in cfgs]
+    procs = min(workers or os.cpu_count() or 1, len(tasks))
+    if procs <= 1:
+        rows = list(map(_evaluate, tasks))
+    else:
+        chunk = max(1, len(tasks) // (4 * procs))
+        with ProcessPoolExecutor(max_workers=procs) as pool:
+            rows = list(pool.map(_evaluate, tasks, chunksize=chunk))
+    period, n0, n1, n2 = np.array(rows, dtype=float).reshape(-1, 4).T
+    columns.update(period=period, norm_0=n0, norm_T4=n1, norm_T2=n2)
+
+    if figures is not None:
+        jobs = []
+        width = len(str(len(cfgs) - 1))
+        for i, cfg in enumerate(cfgs):
+            jobs += figure_jobs(cfg, Path(figures) / f"{i:0{width}d}")
+        render(jobs, workers=workers)
+    return columns
+
+
+def write_table(columns: Mapping[str, np.ndarray], path: str | Path) -> Path:
+    """Write sweep columns as .csv, .npz or .parquet, chosen by suffix.
+
+    Parquet output needs pyarrow.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".npz":
+        np.savez(path, **columns)
+    elif suffix == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(zip(*(np.asarray(c).tolist() for c in columns.values())))
+    elif suffix == ".parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("writing .parquet tables requires pyarrow") from None
+        pq.write_table(pa.table({k: np.asarray(v) for k, v in columns.items()}), path)
+    else:
+        raise ValueError(f"unsupported table format {suffix!r}")
+    return path
@@ -0,0 +1,159 @@
+"""Canonical thermodynamics and quantum occupancies over box spectra.
+
+A spectrum enters as its distinct levels and their degeneracies, so a cube
+at high temperature needs one entry per integer s rather than one per
+state (see ``qbox.counting``). All quantities take a whole array of
+temperatures at once: the Boltzmann factors form a (temperatures x levels)
+matrix, and Z, U and C come out of one product with a (levels x 3) table
+of moments. Energies are measured from the ground level before
+exponentiating, which is the log-sum-exp shift: every exponent is <= 0 and
+log Z never overflows.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from . import units
+from .counting import degeneracies
+from .spectrum import Spectrum, energy_unit
+
+# Boltzmann weight, relative to Z, that the truncated tail may carry.
+TAIL_TOL = 1e-12
+# Temperatures per block of the Boltzmann matrix, bounding its memory.
+BLOCK_BYTES = 32 * 2**20
+
+
+@dataclass(frozen=True)
+class Levels:
+    """Distinct energies ``E`` (J, ascending) and their degeneracies ``g``."""
+
+    E: np.ndarray
+    g: np.ndarray
+
+    @classmethod
+    def from_spectrum(cls, spec: Spectrum, m: float, L: float) -> Levels:
+        """Levels of ``spec`` for mass ``m`` and reference length ``L``."""
+        return cls(spec.levels * energy_unit(m, L), spec.degeneracy.astype(float))
+
+
+def cube_levels(dim: int, m: float, L: float, smax: int) -> Levels:
+    """Every level of the cubic box with sum(n_i^2) <= smax."""
+    g = degeneracies(dim, smax)
+    s = np.flatnonzero(g)
+    return Levels(s * energy_unit(m, L), g[s].astype(float))
+
+
+def cube_cutoff(dim: int, m: float, L: float, T: float, tol: float = TAIL_TOL) -> int:
+    """Smallest smax whose truncated spectrum misses < ``tol`` of Z at ``T``.
+
+    Starts where the Boltzmann factor of the top level falls to ``tol``
+    and doubles while the top quarter of the kept levels still carries more
+    than ``tol`` of Z. Beyond the peak of g(E) exp(-E / kT) the weight per
+    shell decays at least geometrically, so the top quarter is a safe
+    estimate of the discarded tail.
+    """
+    unit = energy_unit(m, L)
+    smax = max(4 * dim, int(math.ceil(dim + math.log(1 / tol) * units.k * T / unit)))
+    while True:
+        lv = cube_levels(dim, m, L, smax)
+        w = lv.g * np.exp(-(lv.E - lv.E[0]) / (units.k * T))
+        top = lv.E >= lv.E[0] + 0.75 * (lv.E[-1] - lv.E[0])
+        if w[top].sum() <= tol * w.sum():
+            return smax
+        smax *= 2
+
+
+@dataclass(frozen=True)
+class Thermal:
+    """Canonical averages at temperatures ``T`` (K).
+
+    ``logZ`` is dimensionless, ``U`` and ``F`` are in J per particle and
+    ``C`` and ``S`` in J/K per particle.
+    """
+
+    T: np.ndarray
+    logZ: np.ndarray
+    U: np.ndarray
+    C: np.ndarray
+
+    @property
+    def F(self) -> np.ndarray:
+        """Helmholtz free energy -k T log Z."""
+        return -units.k * self.T * self.logZ
+
+    @property
+    def S(self) -> np.ndarray:
+        """Entropy (U - F) / T."""
+        return (self.U - self.F) / self.T
+
+
+def canonical(levels: Levels, T: Sequence[float] | np.ndarray) -> Thermal:
+    """Z, U and C of one particle on ``levels`` for every temperature in ``T``.
+
+    With x = E - E_0 and weights w = g exp(-x / kT):
+    log Z = -E_0 / kT + log sum(w), U = E_0 + <x>, and
+    C = (<x^2> - <x>^2) / (k T^2).
+    """
+    T = np.asarray(T, dtype=float)
+    beta = 1.0 / (units.k * T.ravel())
+    x = levels.E - levels.E[0]
+    moments = np.empty((beta.size, 3))
+    step = max(1, BLOCK_BYTES // (8 * x.size))
+    for i in range(0, beta.size, step):
+        w = np.exp(-np.multiply.outer(beta[i : i + step], x))
+        moments[i : i + step] = w @ np.column_stack(
+            [levels.g, levels.g * x, levels.g * x * x]
+        )
+    z, m1, m2 = moments.T
+    mean = m1 / z
+    var = np.maximum(m2 / z - mean * mean, 0.0)
+    shape = T.shape
+    return Thermal(
+        T=T,
+        logZ=(np.log(z) - beta * levels.E[0]).reshape(shape),
+        U=(levels.E[0] + mean).reshape(shape),
+        C=(units.k * beta * beta * var).reshape(shape),
+    )
+
+
+def box_thermal(
+    dim: int,
+    m: float,
+    L: float,
+    T: Sequence[float] | np.ndarray,
+    tol: float = TAIL_TOL,
+) -> Thermal:
+    """``canonical`` for the cubic box, truncated adaptively for max(T)."""
+    T = np.asarray(T, dtype=float)
+    smax = cube_cutoff(dim, m, L, float(T.max()), tol)
+    return canonical(cube_levels(dim, m, L, smax), T)
+
+
+def fermi_dirac(
+    E: np.ndarray | float, mu: np.ndarray | float, T: np.ndarray | float
+) -> np.ndarray:
+    """1 / (exp((E - mu) / kT) + 1), broadcast, without overflow.
+
+    Evaluated as exp(-log(1 + e^x)) with ``logaddexp``, which keeps full
+    relative accuracy deep in the upper tail.
+    """
+    x = (np.asarray(E) - mu) / (units.k * np.asarray(T, dtype=float))
+    return np.exp(-np.logaddexp(0.0, x))
+
+
+def bose_einstein(
+    E: np.ndarray | float, mu: np.ndarray | float, T: np.ndarray | float
+) -> np.ndarray:
+    """1 / (exp((E - mu) / kT) - 1), broadcast; requires mu < E.
+
+    ``expm1`` keeps the occupancy accurate as E approaches mu.
+    """
+    gap = np.asarray(E) - mu
+    if np.any(gap <= 0):
+        raise ValueError("Bose-Einstein occupancy needs mu below every level")
+    return 1.0 / np.expm1(gap / (units.k * np.asarray(T, dtype=float)))
@@ -0,0 +1,21 @@
+"""Physical constants, read from ``scipy.constants`` on first access.
+
+``units.hbar``, ``units.e``, ``units.m_e`` and any other name defined by
+``scipy.constants`` resolve lazily, so importing the numerics does not pay
+for importing scipy.
+"""
+
+from __future__ import annotations
+
+
+def __getattr__(name: str) -> float:
+    if name.startswith("__"):
+        raise AttributeError(name)
+    from scipy import constants
+
+    try:
+        value = float(getattr(constants, name))
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from . import units
+from .basis import SeparableBasis
+from .precision import dtypes
+from .superposition import amplitudes
+
+BLOCK_BYTES = 64 * 2**20
+
+
+def write_volume(
+    path: str | Path,
+    axes: Sequence[np.ndarray],
+    L: float | Sequence[float],
+    modes: Sequence[Sequence[int]],
+    coeffs: Sequence[complex],
+    energies: Sequence[float],
+    times: Sequence[float] = (0.0,),
+    density: bool = False,
+    block_bytes: int = BLOCK_BYTES,
+    precision: str = "double",
+) -> np.memmap:
+    """Stream psi (or |psi|^2) of a 3D superposition into a .npy file.
+
+    The file has shape (len(times), nz, ny, nx). Only the per-axis sine
+    tables are held in memory; each block of z-planes is formed on the fly as
+
+        psi[t, z] = Fy^T diag(a(t) * Fz[:, z]) Fx
+
+    (one (ny x modes) @ (modes x nx) product per plane) and flushed before
+    the next block, so volumes far larger than RAM can be produced. The
+    block height is chosen to keep each block, including the scaled
+    (ny x modes) tables, under ``block_bytes``.
+    ``precision="single"`` computes and stores complex64/float32, halving the
+    file and the blocks (see ``qbox.precision``). Returns a read-only memory
+    map of the result.
+    """
+    real, cplx = dtypes(precision)
+    x, y, z = (np.asarray(a, dtype=float) for a in axes)
+    basis = SeparableBasis((x, y, z), L, dtype=real)
+    fx, fy, fz = (basis.table(i, [ns[i] for ns in modes]) for i in range(3))
+    c = np.asarray(coeffs, dtype=np.complex128)
+    omega = np.asarray(energies, dtype=float) / units.hbar
+    a = amplitudes(c, omega, times).T.astype(cplx)  # (times, modes)
+    nt = a.shape[0]
+    dtype = real if density else cplx
+    shape = (nt, z.size, y.size, x.size)
+    plane = y.size * x.size
+    # Per z-plane and time: the amplitudes, the Fy table scaled by them
+    # (ny x modes), and the real and imaginary parts and the output (ny x nx).
+    per_plane = nt * (
+        len(modes) * (cplx.itemsize + y.size * real.itemsize)
+        + plane * (2 * real.itemsize + dtype.itemsize)
+    )
+    step = max(1, int(block_bytes // per_plane))
+    fyT = fy.T
+    path = Path(path)
+    with open(path, "wb") as f:
+        np.lib.format.write_array_header_1_0(
+            f,
+            {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": shape,
+            },
+        )
+        start = f.tell()
+        f.truncate(start + int(np.prod(shape)) * dtype.itemsize)
+        for z0 in range(0, z.size, step):
+            z1 = min(z0 + step, z.size)
+            w = a[:, None, :] * fz[:, z0:z1].T[None]  # (times, planes, modes)
+            re = np.matmul(fyT * w.real[..., None, :], fx)
+            im = np.matmul(fyT * w.imag[..., None, :], fx)
+            if density:
+                blk = re * re + im * im
+            else:
+                blk = np.empty(re.shape, dtype=dtype)
+                blk.real = re
+                blk.imag = im
+            for ti in range(nt):
+                f.seek(start + (ti * z.size + z0) * plane * dtype.itemsize)
+                blk[ti].tofile(f)
+    return read_volume(path)
+
+
+def read_volume(path: str | Path) -> np.memmap:
+    """Open a volume written by ``write_volume`` without loading it."""
+    return np.load(Path(path), mmap_mode="r")
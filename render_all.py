@@ -0,0 +1,26 @@
+"""Render the figures of the 1D, 2D and 3D scripts in a single process pool."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+from qbox.pipeline import figure_jobs
+from qbox.render import load_script, render
+
+ROOT = Path(__file__).resolve().parent
+DIMS = ("1D", "2D", "3D")
+
+
+def main() -> None:
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    jobs = []
+    for dim in DIMS:
+        script = load_script(ROOT / dim / "main.py")
+        jobs += figure_jobs(script.config(), ROOT / dim / "pics")
+    for path in render(jobs, workers=workers):
+        print(f"Saved: {path.relative_to(ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
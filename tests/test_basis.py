@@ -0,0 +1,41 @@
+import numpy as np
+
+from qbox.basis import FACTORS, SeparableBasis
+from qbox.core import eigenfunction
+
+
+def test_mode_is_a_fresh_writable_array():
+    x = np.linspace(0.0, 1.0, 33)
+    p = eigenfunction(2, [x], 1.0)
+    q = eigenfunction(2, [x], 1.0)
+    assert p is not q
+    assert p.flags.writeable
+    p *= 2
+    np.testing.assert_allclose(q, np.sqrt(2.0) * np.sin(2 * np.pi * x))
+
+
+def test_modes_do_not_alias_the_factor_cache():
+    x = np.linspace(0.0, 1.0, 17)
+    basis = SeparableBasis([x], 1.0)
+    basis.mode([3])[:] = 0.0
+    assert np.abs(basis.factor(0, 3)).max() > 1.0
+    for axes in ([x, x], [x, 0.5], [x, x, x]):
+        basis = SeparableBasis(axes, 1.0)
+        ns = (1, 2, 3)[: len(axes)]
+        assert basis.mode(ns).flags.writeable
+
+
+def test_factor_cache_is_bounded():
+    x = np.linspace(0.0, 1.0, 1001)
+    old = FACTORS.max_bytes
+    FACTORS.clear()
+    try:
+        FACTORS.max_bytes = 10 * x.nbytes
+        basis = SeparableBasis([x], 1.0)
+        for n in range(1, 50):
+            basis.factor(0, n)
+        assert FACTORS.nbytes <= FACTORS.max_bytes
+        assert len(FACTORS) == 10
+    finally:
+        FACTORS.max_bytes = old
+        FACTORS.clear()
@@ -0,0 +1,43 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from qbox.counting import count, degeneracies, histogram, staircase, weyl
+from qbox.spectrum import energy_unit
+
+
+def _brute(dim, smax):
+    top = int(np.sqrt(smax)) + 1
+    g = np.zeros(smax + 1, dtype=np.int64)
+    for ns in itertools.product(range(1, top + 1), repeat=dim):
+        s = sum(n * n for n in ns)
+        if s <= smax:
+            g[s] += 1
+    return g
+
+
+@pytest.mark.parametrize("dim,smax", [(1, 400), (2, 400), (3, 300)])
+def test_degeneracies_and_counts_match_enumeration(dim, smax):
+    g = _brute(dim, smax)
+    np.testing.assert_array_equal(degeneracies(dim, smax), g)
+    np.testing.assert_array_equal(staircase(dim, smax), np.cumsum(g))
+    for s in (0, dim - 1, dim, 17, 50.5, smax):
+        assert count(dim, s) == g[: int(s) + 1].sum()
+
+
+def test_histogram_bins_exact_counts():
+    dim, m, L, smax = 3, 1.0, 1.0, 200
+    unit = energy_unit(m, L)
+    edges = np.array([0.0, 10.5, 50.0, 120.0, smax]) * unit
+    exact, approx = histogram(dim, m, L, edges)
+    cum = np.cumsum(_brute(dim, smax))
+    idx = np.floor(edges / unit).astype(int)
+    np.testing.assert_array_equal(exact, np.diff(cum[idx]))
+    np.testing.assert_allclose(approx, np.diff(weyl(dim, edges / unit)))
+
+
+def test_weyl_tracks_exact_count():
+    for dim in (2, 3):
+        s = 40_000.0
+        assert abs(count(dim, s) - weyl(dim, s)) < 1e-2 * count(dim, s)
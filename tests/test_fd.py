@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from scipy import constants
+
+from qbox.core import energy
+from qbox.fd import eigenstates, interior_grid
+from qbox.norms import norm
+from qbox.spectrum import first_states
+
+M = constants.m_e
+L = 1e-9
+# Interior points per axis; n + 1 doubles, so the spacing h halves.
+GRIDS = {1: (63, 127), 2: (15, 31), 3: (9, 19)}
+
+
+def _errors(dim, n, k=6, method="auto"):
+    vals, vecs = eigenstates(np.zeros((n,) * dim), L, M, k=k, method=method)
+    exact = energy(first_states(dim, k).states, M, L)
+    return (vals - exact) / exact, vecs
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_zero_potential_matches_analytic_energies(dim):
+    coarse, fine = (_errors(dim, n)[0] for n in GRIDS[dim])
+    s_max = first_states(dim, 6).levels.max()
+    for err, n in ((coarse, GRIDS[dim][0]), (fine, GRIDS[dim][1])):
+        h = 1.0 / (n + 1)
+        # The 3-point Laplacian underestimates n^2 by (n pi h)^2 / 12.
+        assert np.all(err <= 0)
+        assert np.abs(err).max() <= (np.pi * h) ** 2 * s_max / 12 * 1.01
+    # Second order: halving h quarters the error.
+    np.testing.assert_allclose(coarse / fine, 4.0, rtol=0.05)
+
+
+def test_eigenfunctions_are_normalized():
+    n = 31
+    _, vecs = _errors(2, n, k=3)
+    x = np.concatenate([[0.0], interior_grid(n, L), [L]])
+    for psi in vecs:
+        assert norm(np.pad(psi, 1), x, x) == pytest.approx(1.0, rel=1e-10)
+
+
+def test_lobpcg_agrees_with_shift_invert():
+    a, _ = _errors(3, 9, k=4, method="shift-invert")
+    b, _ = _errors(3, 9, k=4, method="lobpcg")
+    np.testing.assert_allclose(a, b, atol=1e-8)
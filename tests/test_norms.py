@@ -0,0 +1,59 @@
+import numpy as np
+
+from qbox.basis import SeparableBasis
+from qbox.norms import norm, overlap, slice_norm
+
+L = (1.0, 1.5, 0.75)
+
+
+def _state(dim, k, seed=0):
+    rng = np.random.default_rng(seed)
+    modes = rng.integers(1, 5, (k, dim))
+    coeffs = rng.normal(size=k) + 1j * rng.normal(size=k)
+    return modes, coeffs
+
+
+def _grid_norm(modes, coeffs, axes, lengths):
+    basis = SeparableBasis(axes, lengths)
+    psi = coeffs @ basis.matrix(modes)
+    free = [a for a in axes if np.ndim(a)]
+    return norm(psi.reshape(basis.shape), *free)
+
+
+def test_overlap_matches_grid_integral():
+    x = np.linspace(0.0, 1.0, 401)
+    ma, ca = _state(2, 12, seed=1)
+    mb, cb = _state(2, 9, seed=2)
+    basis = SeparableBasis([x, x], 1.0)
+    pa, pb = ca @ basis.matrix(ma), cb @ basis.matrix(mb)
+    dens = (pa.conj() * pb).reshape(basis.shape)
+    exact = np.trapezoid(np.trapezoid(dens, x, axis=-1), x)
+    assert abs(overlap(ma, ca, mb, cb) - exact) < 1e-4 * abs(exact)
+    assert overlap(ma, ca, ma, ca) == overlap(ma[::-1], ca[::-1], ma, ca)
+
+
+def test_slice_norm_matches_grid_integral():
+    for dim in (1, 2, 3):
+        modes, coeffs = _state(dim, 10, seed=dim)
+        lengths = L[:dim]
+        axes = [np.linspace(0.0, Li, 41) for Li in lengths]
+        pinned = [None] * dim
+        exact = _grid_norm(modes, coeffs, axes, lengths)
+        assert abs(slice_norm(modes, coeffs, pinned, lengths) - exact) < 1e-6 * exact
+        if dim > 1:
+            pinned = [None] * (dim - 1) + [0.3 * lengths[-1]]
+            axes[-1] = pinned[-1]
+            exact = _grid_norm(modes, coeffs, axes, lengths)
+            got = slice_norm(modes, coeffs, pinned, lengths)
+            assert abs(got - exact) < 1e-6 * exact
+
+
+def test_slice_norm_over_times():
+    modes, coeffs = _state(3, 30)
+    phases = np.exp(-1j * np.outer(np.arange(30), np.linspace(0.0, 1.0, 7)))
+    amps = coeffs[:, None] * phases
+    pinned = [None, 0.4, None]
+    got = slice_norm(modes, amps, pinned, 1.0)
+    assert got.shape == (7,)
+    for t in range(7):
+        assert np.isclose(got[t], slice_norm(modes, amps[:, t], pinned, 1.0))
@@ -0,0 +1,65 @@
+import numpy as np
+from scipy import constants
+
+from qbox.observables import Observables
+
+M = constants.m_e
+LX, LY = 1e-9, 1.6e-9
+MODES = np.array([[1, 1], [2, 1], [1, 2], [3, 2], [2, 3]])
+COEFFS = np.array([1.0, 0.8j, 0.5, -0.3 + 0.2j, 0.4])
+
+
+def _factors(n, x, L, derivative=False):
+    k = n[:, None] * np.pi / L
+    if derivative:
+        return np.sqrt(2.0 / L) * k * np.cos(k * x)
+    return np.sqrt(2.0 / L) * np.sin(k * x)
+
+
+def _grid_expectations(obs, times, n=801):
+    x, y = np.linspace(0.0, LX, n), np.linspace(0.0, LY, n)
+    fx, fy = _factors(MODES[:, 0], x, LX), _factors(MODES[:, 1], y, LY)
+    dx = _factors(MODES[:, 0], x, LX, derivative=True)
+    dy = _factors(MODES[:, 1], y, LY, derivative=True)
+    a = obs.amplitudes(times)
+
+    def field(gx, gy):
+        return np.einsum("tk,ky,kx->tyx", a, gy, gx, optimize=True)
+
+    def integrate(f):
+        return np.trapezoid(np.trapezoid(f, x, axis=-1), y, axis=-1)
+
+    psi, psi_x, psi_y = field(fx, fy), field(dx, fy), field(fx, dy)
+    rho = np.abs(psi) ** 2
+    w = integrate(rho)
+    hbar = constants.hbar
+    return dict(
+        x=np.stack([integrate(rho * x), integrate(rho * y[:, None])], 1) / w[:, None],
+        x2=np.stack([integrate(rho * x**2), integrate(rho * y[:, None] ** 2)], 1)
+        / w[:, None],
+        p=np.stack(
+            [integrate(psi.conj() * psi_x), integrate(psi.conj() * psi_y)], 1
+        ).imag
+        * hbar
+        / w[:, None],
+        p2=np.stack([integrate(np.abs(psi_x) ** 2), integrate(np.abs(psi_y) ** 2)], 1)
+        * hbar**2
+        / w[:, None],
+    )
+
+
+def test_expectations_match_grid_integrals():
+    obs = Observables(MODES, COEFFS, M, (LX, LY))
+    times = np.linspace(0.0, 2e-15, 5)
+    got = obs.evaluate(times)
+    ref = _grid_expectations(obs, times)
+    for key in ("x", "x2", "p", "p2"):
+        scale = np.abs(ref[key]).max()
+        np.testing.assert_allclose(got[key], ref[key], rtol=0, atol=1e-5 * scale)
+
+
+def test_energy_and_uncertainty():
+    obs = Observables(MODES, COEFFS, M, (LX, LY))
+    out = obs.evaluate(np.linspace(0.0, 2e-15, 5))
+    np.testing.assert_allclose(out["p2"].sum(axis=1) / (2 * M), out["E"], rtol=1e-12)
+    assert np.all(out["dxdp"] >= constants.hbar / 2)
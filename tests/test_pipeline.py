@@ -0,0 +1,40 @@
+import pytest
+from scipy import constants
+
+from qbox import cache, cli
+from qbox.pipeline import BoxConfig, run
+
+
+def test_coeffs_must_match_states():
+    with pytest.raises(ValueError, match="coeffs"):
+        BoxConfig(dim=1, L=1e-9, m=1.0, nmax=3, coeffs=[1, 1, 1], n_vals=[1, 2])
+
+
+def test_cli_reports_mismatched_state_as_usage_error(capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["--dim", "1", "--coeffs", "1,1,1", "--no-plots"])
+    assert exc.value.code == 2
+    assert "3 coeffs for 2 states" in capsys.readouterr().err
+
+
+def test_saved_summary_lists_the_animation(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("QBOX_CACHE", "0")
+    cache.default_cache.cache_clear()
+    cfg = BoxConfig(
+        dim=1,
+        L=1e-9,
+        m=constants.m_e,
+        nmax=3,
+        coeffs=[1, 1],
+        n_vals=[1, 2],
+        anim_frames=2,
+        anim_file="frames",
+        workers=1,
+    )
+    try:
+        run(cfg, tmp_path, dpi=20, only=["energy_levels"])
+    finally:
+        cache.default_cache.cache_clear()
+    saved = [line for line in capsys.readouterr().out.splitlines() if "Saved" in line]
+    assert saved == ["Saved: pics/energy_levels.png, pics/frames/"]
+    assert len(list((tmp_path / "pics" / "frames").glob("*.png"))) == 2
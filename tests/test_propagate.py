@@ -0,0 +1,54 @@
+import numpy as np
+from scipy import constants
+
+from qbox.basis import SeparableBasis
+from qbox.core import box_energy
+from qbox.propagate import SpectralPropagator, gaussian_packet
+
+M = constants.m_e
+L = 1e-9
+MODES = np.array([[1, 1], [2, 1], [3, 4], [5, 2]])
+COEFFS = np.array([1.0, 0.5j, -0.4, 0.3 + 0.3j])
+
+
+def _setup(n=(47, 63)):
+    prop = SpectralPropagator(n, L, M)
+    basis = SeparableBasis(prop.grids, L)
+    phi = basis.matrix(MODES).reshape(len(MODES), *prop.shape)
+    return prop, phi
+
+
+def _discrete_norm(prop, psi):
+    cell = np.prod([g[1] - g[0] for g in prop.grids])
+    return float(np.sum(np.abs(psi) ** 2) * cell)
+
+
+def test_eigen_superposition_gets_analytic_phases():
+    prop, phi = _setup()
+    psi0 = np.tensordot(COEFFS, phi, axes=1)
+    E = box_energy(MODES, M, L)
+    times = [0.0, 3e-16, 1.7e-15]
+    for t, psi in zip(times, prop.evolve_many(psi0, times)):
+        expected = np.tensordot(COEFFS * np.exp(-1j * E * t / constants.hbar), phi, 1)
+        np.testing.assert_allclose(psi, expected, atol=1e-10 * np.abs(psi0).max())
+
+
+def test_coefficients_recover_modes():
+    prop, phi = _setup()
+    c = prop.coefficients(np.tensordot(COEFFS, phi, axes=1))
+    for (nx, ny), ck in zip(MODES, COEFFS):
+        assert abs(c[ny - 1, nx - 1] - ck) < 1e-12
+    c[tuple((MODES[:, ::-1] - 1).T)] = 0.0
+    assert np.abs(c).max() < 1e-12
+
+
+def test_norm_preserved_and_time_reversible():
+    prop = SpectralPropagator((63, 95), L, M)
+    psi0 = gaussian_packet(prop.grids, (0.4 * L, 0.5 * L), 0.08 * L, (3e10, -1e10))
+    n0 = _discrete_norm(prop, psi0)
+    t = 2.5e-15
+    psi = prop.evolve(psi0, t)
+    assert abs(_discrete_norm(prop, psi) - n0) < 1e-12 * n0
+    assert np.abs(psi - psi0).max() > 1e-2 * np.abs(psi0).max()
+    back = prop.evolve(psi, -t)
+    np.testing.assert_allclose(back, psi0, atol=1e-10 * np.abs(psi0).max())
@@ -0,0 +1,70 @@
+import pytest
+
+from qbox import cache
+from qbox.render import FigureJob, Manifest, render
+
+
+def build(log: str, label: str):
+    from matplotlib.figure import Figure
+
+    with open(log, "a") as f:
+        f.write(label + "\n")
+    fig = Figure(figsize=(1, 1))
+    fig.text(0.5, 0.5, label)
+    return fig
+
+
+@pytest.fixture
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("QBOX_CACHE_DIR", str(tmp_path / "cache"))
+    cache.default_cache.cache_clear()
+    yield
+    cache.default_cache.cache_clear()
+
+
+def _jobs(tmp_path, labels):
+    log = str(tmp_path / "log.txt")
+    return [
+        FigureJob(
+            f"{__file__}:build",
+            tmp_path / "out" / f"{i}.png",
+            dict(log=log, label=x),
+            dpi=20,
+        )
+        for i, x in enumerate(labels)
+    ]
+
+
+def _calls(tmp_path):
+    path = tmp_path / "log.txt"
+    return path.read_text().split() if path.exists() else []
+
+
+def test_only_dirty_jobs_are_rendered(tmp_path, isolated_cache):
+    jobs = _jobs(tmp_path, ["a", "b"])
+    assert render(jobs, workers=1) == [job.out for job in jobs]
+    assert render(jobs, workers=1) == []
+    assert _calls(tmp_path) == ["a", "b"]
+    changed = _jobs(tmp_path, ["a", "c"])
+    assert render(changed, workers=1) == [changed[1].out]
+    assert _calls(tmp_path) == ["a", "b", "c"]
+    assert Manifest(tmp_path / "out").stale(changed[0]) == []
+    assert Manifest(tmp_path / "out").stale(jobs[1]) == ["label"]
+
+
+def test_edited_or_missing_output_is_rewritten_from_cache(tmp_path, isolated_cache):
+    jobs = _jobs(tmp_path, ["a", "b"])
+    render(jobs, workers=1)
+    jobs[0].out.unlink()
+    with open(jobs[1].out, "ab") as f:
+        f.write(b"x")
+    assert render(jobs, workers=1) == [job.out for job in jobs]
+    assert _calls(tmp_path) == ["a", "b"]
+
+
+def test_force_renders_everything_without_the_cache(tmp_path, isolated_cache):
+    jobs = _jobs(tmp_path, ["a", "b"])
+    render(jobs, workers=1)
+    assert render(jobs, workers=1, force=True) == [job.out for job in jobs]
+    assert _calls(tmp_path) == ["a", "b", "a", "b"]
+    assert render(jobs, workers=1) == []
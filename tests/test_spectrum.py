@@ -0,0 +1,92 @@
+import itertools
+
+import numpy as np
+import pytest
+from scipy import constants
+
+from qbox.core import box_energy, energy
+from qbox.spectrum import (
+    LEVEL_RTOL,
+    Spectrum,
+    box_weights,
+    cube_states,
+    energy_unit,
+    first_states,
+    lowest_states,
+)
+
+M = constants.m_e
+BOXES = [
+    (1e-9, 2e-9),
+    (1e-9, 3e-9),
+    (1e-9, 1.7e-9),
+    (2e-9, 1e-9),
+    (1e-9, 1.5e-9, 2e-9),
+    (1e-9, 1e-9, 2.5e-9),
+]
+
+
+def _brute_levels(lengths, k, nmax=40):
+    """Grouped energies (J) and state sets of the levels holding the k lowest."""
+    states = np.array(list(itertools.product(range(1, nmax + 1), repeat=len(lengths))))
+    E = box_energy(states, M, lengths)
+    order = np.argsort(E, kind="stable")
+    states, E = states[order], E[order]
+    split = np.flatnonzero(np.diff(E) > LEVEL_RTOL * E[1:]) + 1
+    groups = np.split(np.arange(len(E)), split)
+    out, taken = [], 0
+    while taken < k:
+        g = groups[len(out)]
+        out.append((E[g[0]], {tuple(s) for s in states[g]}))
+        taken += len(g)
+    return out
+
+
+@pytest.mark.parametrize("lengths", BOXES)
+def test_lowest_states_match_enumeration(lengths):
+    k = 60
+    spec = lowest_states(k, box_weights(lengths), LEVEL_RTOL)
+    unit = energy_unit(M, lengths[0])
+    brute = _brute_levels(lengths, k)
+    assert len(spec) == k
+    np.testing.assert_allclose(spec.s * unit, box_energy(spec.states, M, lengths))
+    got = [
+        (spec.levels[i] * unit, spec.level_states(i)) for i in range(len(spec.levels))
+    ]
+    for (E, states), (E_ref, ref) in zip(got, brute):
+        assert E == pytest.approx(E_ref, rel=1e-12)
+        assert {tuple(s) for s in states} <= ref
+    # Every level but the last (which k may cut) is complete.
+    for (_, states), (_, ref) in zip(got[:-1], brute):
+        assert {tuple(s) for s in states} == ref
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_cube_paths_agree(dim):
+    a = first_states(dim, 50)
+    b = lowest_states(50, np.ones(dim))
+    np.testing.assert_array_equal(a.states, b.states)
+    np.testing.assert_array_equal(a.levels, b.levels)
+    np.testing.assert_allclose(box_energy(a.states, M, 1e-9), energy(a.states, M, 1e-9))
+
+
+def test_grouping_merges_rounded_degeneracies():
+    lengths = (1e-9, 3e-9)
+    states = np.array([[1, 1], [2, 3], [1, 6], [2, 1]])
+    w = box_weights(lengths)
+    s = (states * states) @ w
+    # (2, 3) and (1, 6) are degenerate in theory; their floats are not.
+    assert s[1] != s[2] and s[1] == pytest.approx(s[2], rel=1e-15)
+    exact = Spectrum.from_states(states, w)
+    grouped = Spectrum.from_states(states, w, LEVEL_RTOL)
+    assert len(exact.levels) == 4
+    assert list(grouped.degeneracy) == [1, 1, 2]
+    assert {tuple(s) for s in grouped.level_states(2)} == {(2, 3), (1, 6)}
+    np.testing.assert_array_equal(exact.grouped(LEVEL_RTOL).degeneracy, [1, 1, 2])
+
+
+def test_cube_states_grouped_on_rectangle():
+    spec = cube_states(2, 6, box_weights((1e-9, 2e-9)), LEVEL_RTOL)
+    # With Ly = 2 Lx, (1, 4) and (2, 2) share s = 5.
+    i = int(np.flatnonzero(np.isclose(spec.levels, 5.0))[0])
+    assert {tuple(s) for s in spec.level_states(i)} == {(1, 4), (2, 2)}
@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+import pytest
+from scipy import constants
+
+from qbox.basis import SeparableBasis
+from qbox.core import box_energy
+from qbox.superposition import SuperpositionState
+
+M = constants.m_e
+H = 2 * math.pi * constants.hbar
+
+
+@pytest.mark.parametrize(
+    "L", [(1e-9, 3e-9), (0.7e-9, 2.1e-9), (1e-9, 1.5e-9), (1e-9, 2**0.5 * 1e-9)]
+)
+def test_accidental_degeneracy_does_not_beat(L):
+    # (2, 3) and (1, 6) are degenerate when Ly = 3 Lx but differ by an ulp.
+    state = SuperpositionState([[1, 1], [2, 3], [1, 6]], [1, 1, 1])
+    ts = state.timescales(M, L)
+    E = np.sort(box_energy(state.modes, M, L))
+    assert ts.slowest <= H / (E[-1] - E[0]) * 1e3
+    assert state.period(M, L) < 1e-12
+
+
+def test_commensurate_box_revives():
+    L = (1e-9, 3e-9)
+    state = SuperpositionState([[1, 1], [2, 3], [1, 6], [2, 1]], [1, 0.5j, 1, 0.3])
+    ts = state.timescales(M, L)
+    E = np.sort(box_energy(state.modes, M, L))
+    assert ts.slowest == pytest.approx(H / (E[1] - E[0]), rel=1e-9)
+    x = np.linspace(0.0, L[0], 31)
+    y = np.linspace(0.0, L[1], 41)
+    evol = state.normalized().evaluator(SeparableBasis([x, y], L), M, L)
+    d0, d1, dh = evol.density([0.0, ts.revival, ts.revival / 2])
+    np.testing.assert_allclose(d1, d0, atol=1e-9 * d0.max())
+    assert np.abs(dh - d0).max() > 1e-3 * d0.max()
+
+
+def test_cube_revival():
+    state = SuperpositionState([[1], [2], [3]], [1, 1, 1])
+    unit = box_energy([[1]], M, 1e-9)[0]
+    assert state.timescales(M, 1e-9).revival == pytest.approx(H / unit)
+
+
+def test_incommensurate_box_has_no_revival():
+    state = SuperpositionState([[1, 1], [2, 1]], [1, 1])
+    ts = state.timescales(M, (1e-9, math.pi * 1e-9))
+    assert ts.revival is None
+    assert state.period(M, (1e-9, math.pi * 1e-9)) == ts.slowest
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from scipy import constants
+
+from qbox import tdse
+from qbox.core import energy
+from qbox.fd import interior_grid
+
+M = constants.m_e
+L = 1e-9
+
+
+def _ground(n):
+    x = interior_grid(n, L)
+    return np.sqrt(2.0 / L) * np.sin(np.pi * x / L)
+
+
+def _evolve(stepper, n, steps):
+    psi0 = _ground(n)
+    stepper.set_state(psi0)
+    return psi0, stepper.advance(steps).copy()
+
+
+def test_split_step_keeps_an_eigenstate_stationary():
+    E1 = energy(1, M, L)
+    dt = 1e-18
+    psi0, psi = _evolve(tdse.SplitStepSine(np.zeros(127), L, M, dt), 127, 200)
+    expected = psi0 * np.exp(-1j * E1 * 200 * dt / constants.hbar)
+    assert np.abs(psi - expected).max() < 1e-8 * np.abs(psi0).max()
+
+
+def test_split_step_without_in_place_transform(monkeypatch):
+    dt = 1e-18
+    V = np.linspace(0.0, 1e-19, 63)
+    _, ref = _evolve(tdse.SplitStepSine(V, L, M, dt), 63, 50)
+    dstn = tdse.fft.dstn
+
+    def copying(x, *args, overwrite_x=False, **kwargs):
+        return dstn(x.copy(), *args, **kwargs)
+
+    monkeypatch.setattr(tdse.fft, "dstn", copying)
+    _, psi = _evolve(tdse.SplitStepSine(V, L, M, dt), 63, 50)
+    np.testing.assert_allclose(psi, ref, rtol=0, atol=1e-12 * np.abs(ref).max())
+
+
+def test_stepper_is_abstract():
+    with pytest.raises(TypeError):
+        tdse._Stepper(np.zeros(8), L, 1e-18)
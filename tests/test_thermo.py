@@ -0,0 +1,79 @@
+import itertools
+
+import numpy as np
+import pytest
+from scipy import constants
+
+from qbox import thermo
+from qbox.spectrum import energy_unit
+
+M = constants.m_e
+K = constants.k
+L = 1e-8
+UNIT = energy_unit(M, L)
+
+
+def _brute(dim, T, nmax=30):
+    """Z, U and C from a direct Boltzmann sum over enumerated states."""
+    ns = np.array(list(itertools.product(range(1, nmax + 1), repeat=dim)))
+    E = (ns * ns).sum(axis=1) * UNIT
+    w = np.exp(-np.multiply.outer(1.0 / (K * np.asarray(T)), E))
+    Z = w.sum(axis=1)
+    U = w @ E / Z
+    C = (w @ (E * E) / Z - U * U) / (K * np.asarray(T) ** 2)
+    return Z, U, C
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_matches_direct_boltzmann_sum(dim):
+    T = np.array([5.0, 20.0, 60.0, 150.0])
+    Z, U, C = _brute(dim, T)
+    th = thermo.box_thermal(dim, M, L, T)
+    np.testing.assert_allclose(np.exp(th.logZ), Z, rtol=1e-10)
+    np.testing.assert_allclose(th.U, U, rtol=1e-10)
+    np.testing.assert_allclose(th.C, C, rtol=1e-8, atol=1e-12 * K)
+    np.testing.assert_allclose(th.F, -K * T * np.log(Z), rtol=1e-10)
+    S = (U + K * T * np.log(Z)) / T
+    np.testing.assert_allclose(th.S, S, rtol=1e-8, atol=1e-12 * K)
+
+
+def test_canonical_on_explicit_levels():
+    levels = thermo.Levels(np.array([0.0, 1.0, 3.0]) * UNIT, np.array([1.0, 2.0, 1.0]))
+    T = 30.0
+    w = levels.g * np.exp(-levels.E / (K * T))
+    th = thermo.canonical(levels, [T])
+    assert th.logZ[0] == pytest.approx(np.log(w.sum()))
+    assert th.U[0] == pytest.approx(w @ levels.E / w.sum())
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_classical_limit(dim):
+    # The cube factorizes into independent axes, so the relative correction
+    # to C = dim k / 2 is that of one axis, O(sqrt(unit / kT)).
+    for ratio in (1e2, 1e3):
+        T = ratio * UNIT / K
+        th = thermo.box_thermal(dim, M, L, [T])
+        assert th.C[0] / (dim * K / 2) - 1 == pytest.approx(0, abs=0.3 / ratio**0.5)
+        assert th.U[0] / (dim * K * T / 2) == pytest.approx(1, abs=2 / ratio**0.5)
+
+
+def test_axes_factorize():
+    T = np.geomspace(1.0, 500.0, 7)
+    one = thermo.box_thermal(1, M, L, T)
+    three = thermo.box_thermal(3, M, L, T)
+    np.testing.assert_allclose(three.logZ, 3 * one.logZ, rtol=1e-10)
+    np.testing.assert_allclose(three.C, 3 * one.C, rtol=1e-8)
+
+
+def test_occupancies():
+    E = np.linspace(1.0, 5.0, 5) * UNIT
+    mu, T = 3.0 * UNIT, 40.0
+    x = (E - mu) / (K * T)
+    np.testing.assert_allclose(thermo.fermi_dirac(E, mu, T), 1 / (np.exp(x) + 1))
+    assert thermo.fermi_dirac(1e3 * UNIT, 0.0, 1.0) >= 0.0
+    np.testing.assert_allclose(
+        thermo.bose_einstein(E, 0.5 * UNIT, T),
+        1 / (np.exp((E - 0.5 * UNIT) / (K * T)) - 1),
+    )
+    with pytest.raises(ValueError):
+        thermo.bose_einstein(E, mu, T)
@@ -0,0 +1,75 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from scipy import constants
+
+from qbox.basis import FACTORS, SeparableBasis
+from qbox.core import box_energy
+from qbox.superposition import SuperpositionEvaluator
+from qbox.volume import write_volume
+
+M = constants.m_e
+L = (1e-9, 1.2e-9, 0.8e-9)
+MODES = [(1, 1, 1), (2, 1, 3), (1, 3, 2), (4, 2, 1)]
+COEFFS = [1.0, 0.5j, -0.3, 0.2 + 0.1j]
+TIMES = [0.0, 1e-16, 7e-16]
+
+
+def _axes(n=(9, 11, 13)):
+    return [np.linspace(0.0, Li, ni) for Li, ni in zip(L, n)]
+
+
+def _direct(axes, modes=MODES, coeffs=COEFFS):
+    E = box_energy(modes, M, L)
+    evol = SuperpositionEvaluator(SeparableBasis(axes, L), modes, coeffs, E)
+    return evol.psi(TIMES)
+
+
+@pytest.mark.parametrize("block_bytes", [1, 2**12, 2**30])
+def test_matches_direct_evaluation(tmp_path, block_bytes):
+    axes = _axes()
+    E = box_energy(MODES, M, L)
+    ref = _direct(axes)
+    psi = write_volume(
+        tmp_path / "v.npy", axes, L, MODES, COEFFS, E, TIMES, block_bytes=block_bytes
+    )
+    assert psi.shape == (len(TIMES), 13, 11, 9)
+    np.testing.assert_allclose(psi, ref, rtol=0, atol=1e-12 * np.abs(ref).max())
+    rho = write_volume(
+        tmp_path / "d.npy", axes, L, MODES, COEFFS, E, TIMES, density=True
+    )
+    np.testing.assert_allclose(rho, np.abs(ref) ** 2, rtol=1e-12, atol=1e-30)
+
+
+def test_single_precision(tmp_path):
+    axes = _axes()
+    ref = _direct(axes)
+    E = box_energy(MODES, M, L)
+    psi = write_volume(
+        tmp_path / "v.npy", axes, L, MODES, COEFFS, E, TIMES, precision="single"
+    )
+    assert psi.dtype == np.complex64
+    np.testing.assert_allclose(psi, ref, rtol=0, atol=1e-5 * np.abs(ref).max())
+
+
+def test_blocks_stay_under_budget_with_many_modes(tmp_path):
+    rng = np.random.default_rng(0)
+    modes = [tuple(ns) for ns in rng.integers(1, 30, (2000, 3))]
+    coeffs = rng.normal(size=len(modes)) + 0j
+    E = box_energy(modes, M, L)
+    axes = _axes((40, 40, 40))
+    budget = 4 * 2**20
+    FACTORS.clear()
+    basis = SeparableBasis(axes, L)
+    for i in range(3):
+        basis.table(i, [ns[i] for ns in modes])  # exclude the shared tables
+    tracemalloc.start()
+    try:
+        write_volume(tmp_path / "v.npy", axes, L, modes, coeffs, E, block_bytes=budget)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        FACTORS.clear()
+    tables = 3 * len(modes) * 40 * 8
+    assert peak < budget + 4 * tables